@@ -10,15 +10,25 @@ Provides REST API for:
 
 import os
 import re
+import sys
 import json
+import time
+import heapq
+import random
 import subprocess
 import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from datetime import datetime
+from difflib import unified_diff
 from typing import Optional, List
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import yaml
 
@@ -31,6 +41,35 @@ CONFIG_DIR = PROJECT_ROOT / "output" / "configs"
 CHANGES_DIR = PROJECT_ROOT / "output" / "changes"
 LOG_DIR = PROJECT_ROOT / "output" / "logs"
 ORCHESTRATOR = PROJECT_ROOT / "scripts" / "orchestrator.py"
+SCHEDULES_FILE = PLAYBOOKS_DIR / "schedules.yml"
+
+# Worker processes that run collections in-process (Ansible loaded once each)
+COLLECTION_WORKERS = int(os.environ.get("COLLECTION_WORKERS", "4"))
+
+# Finished jobs kept for status queries; the oldest are dropped first
+FINISHED_JOBS_LIMIT = 10000
+
+# Shared log summarization lives in the orchestrator
+sys.path.insert(0, str(ORCHESTRATOR.parent))
+from orchestrator import (  # noqa: E402
+    SUMMARY_FILE,
+    CHANGESETS_FILE,
+    log_summary_file,
+    write_log_summary,
+    update_fleet_summary,
+    record_collection_result,
+    filter_ignore_lines,
+    split_hunks,
+    load_history_index,
+    reconstruct_version,
+    load_line_index,
+    read_line_window,
+    init_worker,
+    run_collection_job,
+    event_segments,
+    event_log_head,
+    read_events,
+)
 
 # Ensure directories exist
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
@@ -55,6 +94,33 @@ app.add_middleware(
 # Track running jobs
 running_jobs = {}
 
+# Hostname -> its queued/pending/running job id, and finished job ids oldest first
+active_jobs = {}
+finished_jobs = deque()
+
+# Collection worker pool, created on startup
+collection_pool = {"executor": None}
+
+# Correlated change-sets, re-read when the orchestrator updates them
+changesets_cache = {
+    "data": [],
+    "mtime": None
+}
+
+# Parsed inventory, refreshed when inventory or host/group vars change
+inventory_cache = {
+    "key": None,
+    "hosts": None,
+    "hosts_by_group": None
+}
+
+# Materialized dashboard summary. Collection counters are persisted by the
+# orchestrator (output/summary.json); inventory counts come from inventory_cache.
+fleet_summary = {
+    "data": None,
+    "mtime": None
+}
+
 
 class HostCreate(BaseModel):
     hostname: str
@@ -74,11 +140,41 @@ class JobStatus(BaseModel):
     error: Optional[str] = None
 
 
+class BulkSelection(BaseModel):
+    hosts: Optional[List[str]] = None
+    groups: Optional[List[str]] = None
+    selector: Optional[dict] = None  # host field -> required value
+    fields: Optional[List[str]] = None
+
+
 # ============== Host Management ==============
 
+def inventory_cache_key() -> tuple:
+    """Modification times of everything ansible-inventory reads."""
+    files = [INVENTORY_FILE]
+    files.extend(HOST_VARS_DIR.glob("*.yml"))
+    files.extend((PLAYBOOKS_DIR / "group_vars").glob("*.yml"))
+    return tuple(sorted((str(f), f.stat().st_mtime_ns) for f in files))
+
+
 @app.get("/api/hosts")
 async def list_hosts():
     """Get all hosts from inventory."""
+    key = inventory_cache_key()
+    if inventory_cache["key"] != key:
+        hosts = read_inventory_hosts()
+        hosts_by_group = {}
+        for host in hosts:
+            hosts_by_group[host["group"]] = hosts_by_group.get(host["group"], 0) + 1
+        inventory_cache["hosts"] = hosts
+        inventory_cache["hosts_by_group"] = hosts_by_group
+        inventory_cache["key"] = key
+
+    return {"hosts": inventory_cache["hosts"]}
+
+
+def read_inventory_hosts() -> List[dict]:
+    """Read hosts from ansible-inventory."""
     try:
         result = subprocess.run(
             ["ansible-inventory", "-i", str(INVENTORY_FILE), "--list"],
@@ -107,10 +203,11 @@ async def list_hosts():
                 "group": group_map.get(hostname, "unknown"),
                 "ansible_host": host_vars.get("ansible_host", hostname),
                 "ansible_connection": host_vars.get("ansible_connection", ""),
-                "ansible_network_os": host_vars.get("ansible_network_os", "")
+                "ansible_network_os": host_vars.get("ansible_network_os", ""),
+                "site": host_vars.get("site", "default")
             })
 
-        return {"hosts": hosts}
+        return hosts
     except subprocess.CalledProcessError as e:
         raise HTTPException(status_code=500, detail=f"Error reading inventory: {e.stderr}")
     except json.JSONDecodeError as e:
@@ -170,6 +267,8 @@ async def add_host(host: HostCreate):
         with open(host_vars_file, 'w') as f:
             yaml.dump(host_vars, f, default_flow_style=False)
 
+        inventory_cache["key"] = None
+
         return {"message": f"Host '{host.hostname}' added successfully", "hostname": host.hostname}
 
     except HTTPException:
@@ -190,60 +289,87 @@ async def run_orchestrator_async(hostname: str, job_id: str):
 
         running_jobs[job_id]["log_file"] = str(log_file)
 
-        # Run orchestrator
-        process = await asyncio.create_subprocess_exec(
-            "python3", str(ORCHESTRATOR), "--host", hostname,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.STDOUT,
-            cwd=str(PROJECT_ROOT)
-        )
-
-        stdout, _ = await process.communicate()
-
-        # Write log
+        # Run orchestrator in a warm worker process
+        loop = asyncio.get_running_loop()
+        executor = collection_pool["executor"]
+        try:
+            ok, content, error = await loop.run_in_executor(executor, run_collection_job, hostname)
+        except BrokenProcessPool:
+            # A worker died (OOM, crash in an Ansible fork): the pool is unusable
+            # from now on, so replace it for later jobs and fail this one
+            replace_collection_pool(executor)
+            raise
+
+        # Write log and its error summary sidecar
         with open(log_file, 'w') as f:
-            f.write(stdout.decode())
+            f.write(content)
+        write_log_summary(log_file, content)
 
-        if process.returncode == 0:
-            running_jobs[job_id]["status"] = "completed"
+        if ok:
+            finish_job(job_id, "completed")
         else:
-            running_jobs[job_id]["status"] = "failed"
-            running_jobs[job_id]["error"] = f"Process exited with code {process.returncode}"
-
-        running_jobs[job_id]["completed_at"] = datetime.now().isoformat()
+            finish_job(job_id, "failed", error)
+            record_collection_result(hostname, False)
 
     except Exception as e:
-        running_jobs[job_id]["status"] = "failed"
-        running_jobs[job_id]["error"] = str(e)
-        running_jobs[job_id]["completed_at"] = datetime.now().isoformat()
+        finish_job(job_id, "failed", str(e))
 
 
-@app.post("/api/run/{hostname}")
-async def run_config_collection(hostname: str, background_tasks: BackgroundTasks):
-    """Trigger configuration collection for a host."""
-    # Verify host exists
-    hosts_response = await list_hosts()
-    host_exists = any(h["hostname"] == hostname for h in hosts_response["hosts"])
+def find_active_job(hostname: str) -> Optional[dict]:
+    """Get the queued/pending/running job for a host, if any."""
+    job_id = active_jobs.get(hostname)
+    return running_jobs.get(job_id) if job_id else None
 
-    if not host_exists:
-        raise HTTPException(status_code=404, detail=f"Host '{hostname}' not found")
 
-    # Check if already running
-    for job_id, job in running_jobs.items():
-        if job["hostname"] == hostname and job["status"] == "running":
-            return {"job_id": job_id, "message": "Job already running", "status": "running"}
+def finish_job(job_id: str, status: str, error: Optional[str] = None):
+    """Mark a job completed/failed and drop the oldest finished jobs over the limit."""
+    job = running_jobs[job_id]
+    job["status"] = status
+    job["error"] = error
+    job["completed_at"] = datetime.now().isoformat()
+    if active_jobs.get(job["hostname"]) == job_id:
+        del active_jobs[job["hostname"]]
 
-    # Create new job
+    finished_jobs.append(job_id)
+    while len(finished_jobs) > FINISHED_JOBS_LIMIT:
+        old_id = finished_jobs.popleft()
+        # A newer job may have reused the id (same host, same second)
+        if running_jobs.get(old_id, {}).get("status") in ("completed", "failed"):
+            del running_jobs[old_id]
+
+
+def create_job(hostname: str, status: str = "pending") -> str:
+    """Register a new job for a host."""
     job_id = f"{hostname}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     running_jobs[job_id] = {
         "job_id": job_id,
         "hostname": hostname,
-        "status": "pending",
+        "status": status,
         "started_at": datetime.now().isoformat(),
         "completed_at": None,
         "log_file": None,
         "error": None
     }
+    active_jobs[hostname] = job_id
+    return job_id
+
+
+@app.post("/api/run/{hostname}")
+async def run_config_collection(hostname: str, background_tasks: BackgroundTasks):
+    """Trigger configuration collection for a host."""
+    # Verify host exists
+    hosts_response = await list_hosts()
+    host_exists = any(h["hostname"] == hostname for h in hosts_response["hosts"])
+
+    if not host_exists:
+        raise HTTPException(status_code=404, detail=f"Host '{hostname}' not found")
+
+    # Check if already running
+    active_job = find_active_job(hostname)
+    if active_job:
+        return {"job_id": active_job["job_id"], "message": f"Job already {active_job['status']}", "status": active_job["status"]}
+
+    job_id = create_job(hostname)
 
     # Start background task
     background_tasks.add_task(run_orchestrator_async, hostname, job_id)
@@ -261,9 +387,388 @@ async def get_job_status(job_id: str):
 
 
 @app.get("/api/jobs")
-async def list_jobs():
-    """List all jobs."""
-    return {"jobs": list(running_jobs.values())}
+async def list_jobs(ids: Optional[str] = None, fields: Optional[str] = None):
+    """List all jobs, or a batch of jobs by comma-separated ids."""
+    if ids is None:
+        jobs = list(running_jobs.values())
+    else:
+        jobs = [running_jobs[job_id] for job_id in ids.split(",") if job_id in running_jobs]
+
+    if fields:
+        jobs = [select_fields(job, fields.split(",")) for job in jobs]
+
+    return {"jobs": jobs}
+
+
+# ============== Scheduled Collection ==============
+
+class TokenBucket:
+    """Token bucket limiting how many sessions may start per second."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready(self) -> bool:
+        """Whether a session could start now without waiting."""
+        self.refill()
+        return self.tokens >= 1
+
+    async def acquire(self):
+        while True:
+            self.refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SiteLimiter:
+    """Session start rate and concurrency limits for one site (or globally)."""
+
+    def __init__(self, sessions_per_second: float, max_concurrent: int):
+        self.bucket = TokenBucket(sessions_per_second)
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_concurrent = max_concurrent
+
+    def ready(self) -> bool:
+        """Whether the site has a free slot and a session token right now."""
+        return not self.semaphore.locked() and self.bucket.ready()
+
+
+# Scheduler state: loaded from playbooks/schedules.yml on startup
+scheduler = {
+    "schedules": [],
+    "queue": [],            # heap of (due monotonic time, seq, job id, site)
+    "seq": 0,
+    "global": None,
+    "sites": {},
+    "site_defaults": {},
+    "backpressure_latency": 300,
+    "skipped_sweeps": 0,
+    "last_sweeps": {},
+    "slot_freed": asyncio.Event()
+}
+
+
+def cron_field_matches(field: str, value: int, low: int, high: int) -> bool:
+    """Check a single cron field (supports *, lists, ranges and steps)."""
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/")
+            step = int(step_str)
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-"))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if start <= value <= end and (value - start) % step == 0:
+            return True
+    return False
+
+
+# (low, high) of the five cron fields: minute, hour, day, month, weekday
+CRON_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+
+def validate_cron(expr: str):
+    """Raise ValueError unless expr is a 5-field cron expression cron_matches() can evaluate."""
+    fields = expr.split()
+    if len(fields) != len(CRON_FIELD_RANGES):
+        raise ValueError(f"expected 5 fields, got {len(fields)}")
+
+    for field, (low, high) in zip(fields, CRON_FIELD_RANGES):
+        for part in field.split(","):
+            base, _, step = part.partition("/")
+            if step and (not step.isdigit() or int(step) == 0):
+                raise ValueError(f"invalid step in '{part}'")
+            if base == "*":
+                continue
+            bounds = base.split("-")
+            if len(bounds) > 2 or not all(bound.isdigit() for bound in bounds):
+                raise ValueError(f"invalid value '{part}'")
+            start, end = int(bounds[0]), int(bounds[-1])
+            if not low <= start <= end <= high:
+                raise ValueError(f"'{part}' outside {low}-{high}")
+
+
+def cron_matches(expr: str, when: datetime) -> bool:
+    """Check whether a 5-field cron expression matches a minute."""
+    minute, hour, day, month, weekday = expr.split()
+    return (
+        cron_field_matches(minute, when.minute, 0, 59)
+        and cron_field_matches(hour, when.hour, 0, 23)
+        and cron_field_matches(day, when.day, 1, 31)
+        and cron_field_matches(month, when.month, 1, 12)
+        # cron counts weekdays from Sunday = 0
+        and cron_field_matches(weekday, (when.weekday() + 1) % 7, 0, 6)
+    )
+
+
+def load_schedules():
+    """Load schedules and rate limits from playbooks/schedules.yml."""
+    config = {}
+    if SCHEDULES_FILE.exists():
+        with open(SCHEDULES_FILE, 'r') as f:
+            config = yaml.safe_load(f) or {}
+
+    limits = config.get("rate_limits", {})
+    scheduler["global"] = SiteLimiter(
+        limits.get("sessions_per_second", 2),
+        limits.get("max_concurrent", 10)
+    )
+    scheduler["site_defaults"] = limits.get("site_defaults", {"sessions_per_second": 1, "max_concurrent": 5})
+    scheduler["sites"] = {}
+    for site, site_limits in (limits.get("sites") or {}).items():
+        scheduler["sites"][site] = SiteLimiter(
+            site_limits.get("sessions_per_second", 1),
+            site_limits.get("max_concurrent", 5)
+        )
+    scheduler["backpressure_latency"] = limits.get("backpressure_latency", 300)
+
+    scheduler["schedules"] = []
+    for position, schedule in enumerate(config.get("schedules") or [], 1):
+        # Skip invalid entries here: an error in scheduler_loop would stop every sweep
+        try:
+            if not isinstance(schedule, dict) or not schedule.get("name") or not schedule.get("cron"):
+                raise ValueError("'name' and 'cron' are required")
+            validate_cron(str(schedule["cron"]))
+            if not isinstance(schedule.get("jitter", 0), (int, float)) or schedule.get("jitter", 0) < 0:
+                raise ValueError("'jitter' must be a non-negative number of seconds")
+        except ValueError as e:
+            print(f"[scheduler] Ignoring schedule #{position} in {SCHEDULES_FILE.name}: {e}")
+            continue
+
+        targets = schedule.get("targets", "all")
+        if isinstance(targets, str):
+            targets = [targets]
+        scheduler["schedules"].append({
+            "name": schedule["name"],
+            "cron": schedule["cron"],
+            "targets": targets,
+            "jitter": schedule.get("jitter", 0)
+        })
+
+
+def get_site_limiter(site: str) -> SiteLimiter:
+    """Get the limiter for a site, creating it from the defaults."""
+    if site not in scheduler["sites"]:
+        defaults = scheduler["site_defaults"]
+        scheduler["sites"][site] = SiteLimiter(
+            defaults.get("sessions_per_second", 1),
+            defaults.get("max_concurrent", 5)
+        )
+    return scheduler["sites"][site]
+
+
+def queue_latency() -> float:
+    """How far behind schedule the oldest queued collection is, in seconds."""
+    queue = scheduler["queue"]
+    if not queue:
+        return 0.0
+    return max(0.0, time.monotonic() - queue[0][0])
+
+
+def enqueue_collection(host: dict, delay: float = 0) -> str:
+    """Queue a rate-limited collection for a host."""
+    job_id = create_job(host["hostname"], status="queued")
+    scheduler["seq"] += 1
+    heapq.heappush(scheduler["queue"], (time.monotonic() + delay, scheduler["seq"], job_id, host["site"]))
+    return job_id
+
+
+async def enqueue_sweep(schedule: dict) -> int:
+    """Queue collections for a schedule's targets with jittered start times."""
+    # Backpressure: don't pile a new sweep onto a queue that is falling behind
+    if queue_latency() > scheduler["backpressure_latency"]:
+        scheduler["skipped_sweeps"] += 1
+        print(f"[scheduler] Skipping sweep '{schedule['name']}': queue latency {queue_latency():.0f}s")
+        return 0
+
+    hosts_response = await list_hosts()
+    targets = set(schedule["targets"])
+
+    queued = 0
+    for host in hosts_response["hosts"]:
+        hostname = host["hostname"]
+        if not ({"all", host["group"], hostname} & targets):
+            continue
+        # Coalesce with collections still queued or running from earlier
+        if find_active_job(hostname):
+            continue
+
+        enqueue_collection(host, random.uniform(0, schedule["jitter"]))
+        queued += 1
+
+    scheduler["last_sweeps"][schedule["name"]] = {
+        "at": datetime.now().isoformat(),
+        "queued": queued
+    }
+    return queued
+
+
+async def run_scheduled_job(hostname: str, job_id: str, site_limiter: SiteLimiter):
+    """Run a scheduled collection, releasing its concurrency slots afterwards."""
+    try:
+        await run_orchestrator_async(hostname, job_id)
+    finally:
+        site_limiter.semaphore.release()
+        scheduler["global"].semaphore.release()
+        scheduler["slot_freed"].set()
+
+
+async def scheduler_loop():
+    """Start due sweeps at the top of every minute."""
+    while True:
+        now = datetime.now()
+        await asyncio.sleep(60 - now.second - now.microsecond / 1_000_000)
+
+        tick = datetime.now().replace(second=0, microsecond=0)
+        for schedule in scheduler["schedules"]:
+            try:
+                if cron_matches(schedule["cron"], tick):
+                    await enqueue_sweep(schedule)
+            except HTTPException as e:
+                print(f"[scheduler] Sweep '{schedule['name']}' failed: {e.detail}")
+            except Exception as e:
+                print(f"[scheduler] Sweep '{schedule['name']}' failed: {e}")
+
+
+async def dispatcher_loop():
+    """Start queued collections once they are due and within rate limits.
+
+    Due jobs for a site that is at its concurrency or rate limit stay
+    queued, so they don't hold up other sites.
+    """
+    queue = scheduler["queue"]
+    while True:
+        if not queue or queue[0][0] > time.monotonic():
+            delay = queue[0][0] - time.monotonic() if queue else 1.0
+            await asyncio.sleep(min(1.0, max(0.0, delay)))
+            continue
+
+        # Earliest due job whose site can start a session now
+        now = time.monotonic()
+        waiting = []
+        picked = None
+        while queue and queue[0][0] <= now:
+            item = heapq.heappop(queue)
+            if get_site_limiter(item[3]).ready():
+                picked = item
+                break
+            waiting.append(item)
+        for item in waiting:
+            heapq.heappush(queue, item)
+
+        if picked is None:
+            # Every due job's site is saturated: wait for a slot (or tokens)
+            scheduler["slot_freed"].clear()
+            try:
+                await asyncio.wait_for(scheduler["slot_freed"].wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        _, _, job_id, site = picked
+        site_limiter = get_site_limiter(site)
+        global_limiter = scheduler["global"]
+
+        # Site slot first (free, checked above), then wait for a global one
+        await site_limiter.semaphore.acquire()
+        await site_limiter.bucket.acquire()
+        await global_limiter.semaphore.acquire()
+        await global_limiter.bucket.acquire()
+
+        hostname = running_jobs[job_id]["hostname"]
+        running_jobs[job_id]["status"] = "pending"
+        asyncio.create_task(run_scheduled_job(hostname, job_id, site_limiter))
+
+
+def new_collection_pool() -> ProcessPoolExecutor:
+    """Spawn the collection worker processes (Ansible loaded by init_worker)."""
+    return ProcessPoolExecutor(
+        max_workers=COLLECTION_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+    )
+
+
+def replace_collection_pool(broken: ProcessPoolExecutor):
+    """Swap a broken worker pool for a new one (once, however many jobs saw it break)."""
+    if collection_pool["executor"] is not broken:
+        return
+    print("[workers] Collection worker died; restarting the worker pool")
+    broken.shutdown(wait=False, cancel_futures=True)
+    collection_pool["executor"] = new_collection_pool()
+
+
+@app.on_event("startup")
+async def start_collection_workers():
+    """Start worker processes that keep Ansible and the inventory loaded."""
+    collection_pool["executor"] = new_collection_pool()
+
+
+@app.on_event("shutdown")
+async def stop_collection_workers():
+    """Stop the collection worker processes."""
+    if collection_pool["executor"]:
+        collection_pool["executor"].shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    """Load schedules and start the scheduler loops."""
+    load_schedules()
+    asyncio.create_task(scheduler_loop())
+    asyncio.create_task(dispatcher_loop())
+
+
+@app.get("/api/schedules")
+async def list_schedules():
+    """Get schedules and scheduler queue/limit status."""
+    global_limiter = scheduler["global"]
+    return {
+        "schedules": scheduler["schedules"],
+        "last_sweeps": scheduler["last_sweeps"],
+        "queue_depth": len(scheduler["queue"]),
+        "queue_latency": queue_latency(),
+        "backpressure": queue_latency() > scheduler["backpressure_latency"],
+        "skipped_sweeps": scheduler["skipped_sweeps"],
+        "global_limits": {
+            "sessions_per_second": global_limiter.bucket.rate,
+            "max_concurrent": global_limiter.max_concurrent
+        },
+        "sites": {
+            site: {
+                "sessions_per_second": limiter.bucket.rate,
+                "max_concurrent": limiter.max_concurrent
+            }
+            for site, limiter in scheduler["sites"].items()
+        }
+    }
+
+
+@app.post("/api/schedules/{name}/run")
+async def run_schedule_now(name: str):
+    """Trigger a schedule's sweep immediately."""
+    for schedule in scheduler["schedules"]:
+        if schedule["name"] == name:
+            queued = await enqueue_sweep(schedule)
+            return {"schedule": name, "queued": queued}
+
+    raise HTTPException(status_code=404, detail=f"Schedule '{name}' not found")
 
 
 # ============== Config/Diff/Log Retrieval ==============
@@ -293,11 +798,20 @@ async def get_host_configs(hostname: str):
 @app.get("/api/configs/{hostname}/latest")
 async def get_latest_config(hostname: str):
     """Get the latest configuration for a host."""
+    config = latest_config_data(hostname)
+    if config is None:
+        raise HTTPException(status_code=404, detail=f"No configs found for {hostname}")
+
+    return config
+
+
+def latest_config_data(hostname: str) -> Optional[dict]:
+    """Load the latest configuration for a host, or None if there is none."""
     pattern = f"{hostname}_*.json"
     files = sorted(CONFIG_DIR.glob(pattern))
 
     if not files:
-        raise HTTPException(status_code=404, detail=f"No configs found for {hostname}")
+        return None
 
     latest = files[-1]
     content = latest.read_text()
@@ -314,6 +828,57 @@ async def get_latest_config(hostname: str):
     }
 
 
+def latest_file(directory: Path, pattern: str) -> Optional[Path]:
+    """Get the newest timestamped file matching a pattern, if any."""
+    files = sorted(directory.glob(pattern))
+    return files[-1] if files else None
+
+
+@app.get("/api/configs/{hostname}/latest/outline")
+async def get_latest_config_outline(hostname: str):
+    """Get the latest configuration's sections and line counts, without content."""
+    latest = latest_file(CONFIG_DIR, f"{hostname}_*.json")
+    if latest is None:
+        raise HTTPException(status_code=404, detail=f"No configs found for {hostname}")
+
+    index = load_line_index(latest)
+
+    return {
+        "hostname": hostname,
+        "filename": latest.name,
+        "timestamp": re.search(r'_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.json$', latest.name).group(1),
+        "line_count": index["streams"]["all"]["count"],
+        "sections": index["sections"]
+    }
+
+
+@app.get("/api/configs/{hostname}/latest/lines")
+async def get_latest_config_lines(
+    hostname: str,
+    section: Optional[str] = None,
+    offset: int = 0,
+    limit: int = Query(200, le=5000)
+):
+    """Get a window of lines from the latest configuration (optionally within a section)."""
+    latest = latest_file(CONFIG_DIR, f"{hostname}_*.json")
+    if latest is None:
+        raise HTTPException(status_code=404, detail=f"No configs found for {hostname}")
+
+    index = load_line_index(latest)
+    start, total = 0, index["streams"]["all"]["count"]
+    if section is not None:
+        match = next((sec for sec in index["sections"] if sec["title"] == section), None)
+        if match is None:
+            raise HTTPException(status_code=404, detail=f"Section '{section}' not found")
+        start, total = match["start"], match["count"]
+
+    offset = max(0, offset)
+    limit = max(0, min(limit, total - offset))
+    lines = read_line_window(latest, index, "all", start + offset, limit)
+
+    return {"filename": latest.name, "section": section, "offset": offset, "total": total, "lines": lines}
+
+
 def parse_config_sections(content: str) -> List[dict]:
     """Parse config content into sections based on === headers."""
     sections = []
@@ -368,6 +933,11 @@ async def get_host_changes(hostname: str):
 @app.get("/api/changes/{hostname}/latest")
 async def get_latest_change(hostname: str):
     """Get the latest change diff for a host."""
+    return latest_change_data(hostname)
+
+
+def latest_change_data(hostname: str) -> dict:
+    """Load the latest change diff for a host."""
     pattern = f"{hostname}_change_*.diff"
     files = sorted(CHANGES_DIR.glob(pattern))
 
@@ -390,6 +960,46 @@ async def get_latest_change(hostname: str):
     }
 
 
+@app.get("/api/changes/{hostname}/latest/outline")
+async def get_latest_change_outline(hostname: str):
+    """Get the latest change diff's line counts, without content."""
+    latest = latest_file(CHANGES_DIR, f"{hostname}_change_*.diff")
+    if latest is None:
+        return {"hostname": hostname, "has_changes": False, "message": "No changes detected"}
+
+    streams = load_line_index(latest)["streams"]
+
+    return {
+        "hostname": hostname,
+        "has_changes": True,
+        "filename": latest.name,
+        "timestamp": re.search(r'_change_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.diff$', latest.name).group(1),
+        "line_count": streams["all"]["count"],
+        "additions_count": streams["additions"]["count"],
+        "removals_count": streams["removals"]["count"]
+    }
+
+
+@app.get("/api/changes/{hostname}/latest/lines")
+async def get_latest_change_lines(
+    hostname: str,
+    stream: str = Query("all", pattern="^(all|additions|removals)$"),
+    offset: int = 0,
+    limit: int = Query(200, le=5000)
+):
+    """Get a window of raw, added or removed lines from the latest change diff."""
+    latest = latest_file(CHANGES_DIR, f"{hostname}_change_*.diff")
+    if latest is None:
+        raise HTTPException(status_code=404, detail=f"No changes found for {hostname}")
+
+    index = load_line_index(latest)
+    total = index["streams"][stream]["count"]
+    offset = max(0, offset)
+    lines = read_line_window(latest, index, stream, offset, limit)
+
+    return {"filename": latest.name, "stream": stream, "offset": offset, "total": total, "lines": lines}
+
+
 def parse_diff(content: str) -> dict:
     """Parse diff content into additions and removals."""
     additions = []
@@ -409,6 +1019,146 @@ def parse_diff(content: str) -> dict:
     }
 
 
+def load_changesets() -> List[dict]:
+    """Get correlated change-sets, re-reading them only when they changed."""
+    if not CHANGESETS_FILE.exists():
+        return []
+
+    mtime = CHANGESETS_FILE.stat().st_mtime_ns
+    if mtime != changesets_cache["mtime"]:
+        changesets_cache["data"] = json.loads(CHANGESETS_FILE.read_text())
+        changesets_cache["mtime"] = mtime
+
+    return changesets_cache["data"]
+
+
+@app.get("/api/changesets")
+async def list_changesets(limit: int = 50, min_hosts: int = 1, hostname: Optional[str] = None):
+    """Get fleet-wide change-sets (hosts sharing the same change), newest first."""
+    changesets = []
+    for changeset in reversed(load_changesets()):
+        if changeset["host_count"] < min_hosts:
+            continue
+        if hostname and hostname not in changeset["hosts"]:
+            continue
+        changesets.append(changeset)
+        if len(changesets) >= limit:
+            break
+
+    return {"changesets": changesets}
+
+
+def load_variant_lines(variant: dict) -> Optional[List[str]]:
+    """Read a change-set variant's hunk from the diff file it points at."""
+    diff_file = CHANGES_DIR / variant["diff_file"]
+    if not diff_file.exists():
+        return None
+    hunks = split_hunks(diff_file.read_text())
+    return hunks[variant["hunk"]] if variant["hunk"] < len(hunks) else None
+
+
+@app.get("/api/changesets/{changeset_id}")
+async def get_changeset(changeset_id: str):
+    """Get a single change-set with its per-host variations (hunk lines included)."""
+    for changeset in load_changesets():
+        if changeset["id"] == changeset_id:
+            variants = [{**variant, "lines": load_variant_lines(variant)} for variant in changeset["variants"]]
+            return {**changeset, "variants": variants}
+
+    raise HTTPException(status_code=404, detail=f"Change-set '{changeset_id}' not found")
+
+
+@app.get("/api/history/{hostname}")
+async def get_host_history(hostname: str):
+    """Get all stored config versions for a host."""
+    return {"hostname": hostname, "versions": load_history_index(hostname)}
+
+
+def resolve_version(index: List[dict], value: Optional[str], default: int, start: bool = False) -> int:
+    """Resolve a version number or timestamp to a stored version.
+
+    Timestamps (2026-03-01_12-00-00) resolve to the latest version collected
+    at or before that time. A date alone (2026-03-01) means the start of
+    that day for the start of a range, and the end of it otherwise. A range
+    start before the first version resolves to the oldest version.
+    """
+    if value is None:
+        return default
+
+    if value.isdigit():
+        version = int(value)
+        if not 1 <= version <= len(index):
+            raise HTTPException(status_code=404, detail=f"Version {version} not found")
+        return version
+
+    for fmt in ("%Y-%m-%d_%H-%M-%S", "%Y-%m-%d"):
+        try:
+            datetime.strptime(value, fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid version '{value}': use a version number, YYYY-MM-DD or YYYY-MM-DD_HH-MM-SS"
+        )
+
+    if len(value) == 10:
+        value += "_00-00-00" if start else "_23-59-59"
+
+    version = None
+    for entry in index:
+        if entry["timestamp"] > value:
+            break
+        version = entry["version"]
+
+    if version is None:
+        if start:
+            return index[0]["version"]
+        raise HTTPException(status_code=404, detail=f"No version at or before {value}")
+    return version
+
+
+@app.get("/api/diff/{hostname}")
+async def diff_versions(
+    hostname: str,
+    from_version: Optional[str] = Query(None, alias="from"),
+    to_version: Optional[str] = Query(None, alias="to")
+):
+    """Diff any two stored config versions of a host."""
+    index = load_history_index(hostname)
+    if not index:
+        raise HTTPException(status_code=404, detail=f"No history found for {hostname}")
+
+    to_v = resolve_version(index, to_version, len(index))
+    from_v = resolve_version(index, from_version, max(1, to_v - 1), start=True)
+
+    from_entry = index[from_v - 1]
+    to_entry = index[to_v - 1]
+    # Every line newline-terminated (filter_ignore_lines() drops the last
+    # one), as in the orchestrator's diffs, so the final -/+ lines stay apart
+    from_lines, to_lines = (
+        [line + "\n" for line in filter_ignore_lines(reconstruct_version(hostname, v, index)).splitlines()]
+        for v in (from_v, to_v)
+    )
+
+    content = "".join(unified_diff(
+        from_lines,
+        to_lines,
+        fromfile=from_entry["source"],
+        tofile=to_entry["source"],
+    ))
+
+    return {
+        "hostname": hostname,
+        "from": from_entry,
+        "to": to_entry,
+        "has_changes": bool(content),
+        "content": content,
+        "diff": parse_diff(content)
+    }
+
+
 @app.get("/api/logs/{hostname}")
 async def get_host_logs(hostname: str):
     """Get all log files for a host."""
@@ -448,79 +1198,194 @@ async def get_latest_log(hostname: str):
     latest = sorted(files, key=lambda x: x.stat().st_mtime)[-1]
     content = latest.read_text()
 
-    # Extract errors from log
-    errors = extract_errors(content)
+    summary = load_log_summary(latest, content)
 
     return {
         "hostname": hostname,
         "filename": latest.name,
         "path": str(latest),
         "content": content,
-        "errors": errors,
-        "has_errors": len(errors) > 0
+        "errors": summary["errors"],
+        "has_errors": summary["has_errors"],
+        "failures": summary["failures"],
+        "failure_counts": summary["failure_counts"]
     }
 
 
-def extract_errors(content: str) -> List[str]:
-    """Extract error lines from log content."""
-    error_patterns = [
-        r'.*\[ERROR\].*',
-        r'.*error:.*',
-        r'.*Error:.*',
-        r'.*FAILED.*',
-        r'.*fatal:.*',
-        r'.*unreachable.*'
-    ]
+def load_log_summary(log_file: Path, content: Optional[str] = None) -> dict:
+    """Load the precomputed error summary for a log, building it if missing."""
+    summary_file = log_summary_file(log_file)
+    if summary_file.exists():
+        try:
+            return json.loads(summary_file.read_text())
+        except json.JSONDecodeError:
+            pass
 
-    errors = []
-    for line in content.split('\n'):
-        for pattern in error_patterns:
-            if re.match(pattern, line, re.IGNORECASE):
-                errors.append(line.strip())
-                break
+    # Logs written before summaries existed: build the sidecar once
+    return write_log_summary(log_file, content)
+
+
+# ============== Change Events ==============
+
+@app.get("/api/events")
+async def get_events(
+    since: int = 0,
+    limit: int = Query(1000, le=10000),
+    wait: float = Query(0, ge=0, le=60)
+):
+    """Get change events from offset `since`; long-polls up to `wait` seconds."""
+    deadline = time.monotonic() + wait
+    while event_log_head() <= since and time.monotonic() < deadline:
+        await asyncio.sleep(0.5)
+
+    events = read_events(since, limit)
+    segments = event_segments()
+
+    return {
+        "events": events,
+        "next_offset": events[-1]["offset"] + 1 if events else max(since, event_log_head()),
+        # Events before this offset were dropped by retention
+        "first_offset": int(segments[0].stem) if segments else 0
+    }
+
+
+@app.get("/api/events/stream")
+async def stream_events(since: int = 0):
+    """Stream change events from offset `since` as NDJSON, following new ones."""
+    async def follow():
+        offset = since
+        while True:
+            head = event_log_head()
+            if head > offset:
+                events = read_events(offset, 1000)
+                for event in events:
+                    yield json.dumps(event) + "\n"
+                offset = events[-1]["offset"] + 1 if events else head
+            else:
+                await asyncio.sleep(0.5)
+
+    return StreamingResponse(follow(), media_type="application/x-ndjson")
+
+
+# ============== Bulk Operations ==============
+
+def select_fields(record: dict, fields: Optional[List[str]]) -> dict:
+    """Keep only the requested fields of a record."""
+    if not fields:
+        return record
+    return {field: record[field] for field in fields if field in record}
+
+
+async def resolve_selection(selection: BulkSelection) -> tuple:
+    """Resolve a bulk selection against the inventory in one pass.
+
+    Returns (matched hosts, requested hostnames not in inventory).
+    """
+    if not (selection.hosts or selection.groups or selection.selector):
+        raise HTTPException(status_code=400, detail="Specify hosts, groups or selector")
+
+    hosts_response = await list_hosts()
+    requested = set(selection.hosts or [])
+    groups = set(selection.groups or [])
+
+    matched = []
+    found = set()
+    for host in hosts_response["hosts"]:
+        if requested and host["hostname"] not in requested:
+            continue
+        if groups and host["group"] not in groups:
+            continue
+        if selection.selector and any(host.get(k) != v for k, v in selection.selector.items()):
+            continue
+        matched.append(host)
+        found.add(host["hostname"])
+
+    return matched, sorted(requested - found)
+
+
+def ndjson_stream(hosts: List[dict], not_found: List[str], load, fields: Optional[List[str]]):
+    """Stream one JSON object per host, then one per requested host not in inventory."""
+    for host in hosts:
+        record = load(host["hostname"])
+        if record is None:
+            record = {"hostname": host["hostname"], "error": "not found"}
+        yield json.dumps(select_fields(record, fields)) + "\n"
+    for hostname in not_found:
+        yield json.dumps({"hostname": hostname, "error": "not in inventory"}) + "\n"
 
-    return errors
+
+@app.post("/api/bulk/run")
+async def bulk_run(selection: BulkSelection):
+    """Queue configuration collection for many hosts."""
+    hosts, not_found = await resolve_selection(selection)
+
+    jobs = []
+    for host in hosts:
+        active_job = find_active_job(host["hostname"])
+        if active_job:
+            jobs.append({"hostname": host["hostname"], "job_id": active_job["job_id"], "status": active_job["status"]})
+            continue
+
+        job_id = enqueue_collection(host)
+        jobs.append({"hostname": host["hostname"], "job_id": job_id, "status": "queued"})
+
+    return {"jobs": jobs, "not_found": not_found}
+
+
+@app.post("/api/bulk/configs")
+async def bulk_latest_configs(selection: BulkSelection):
+    """Stream latest configurations for many hosts as NDJSON."""
+    hosts, not_found = await resolve_selection(selection)
+    return StreamingResponse(
+        ndjson_stream(hosts, not_found, latest_config_data, selection.fields),
+        media_type="application/x-ndjson"
+    )
+
+
+@app.post("/api/bulk/changes")
+async def bulk_latest_changes(selection: BulkSelection):
+    """Stream latest change summaries for many hosts as NDJSON."""
+    hosts, not_found = await resolve_selection(selection)
+    return StreamingResponse(
+        ndjson_stream(hosts, not_found, latest_change_data, selection.fields),
+        media_type="application/x-ndjson"
+    )
 
 
 # ============== Dashboard Summary ==============
 
+def load_fleet_summary() -> dict:
+    """Get the persisted fleet summary, re-reading it only when it changed."""
+    if not SUMMARY_FILE.exists():
+        # First run: materialize from existing history once
+        update_fleet_summary(lambda summary: None)
+
+    mtime = SUMMARY_FILE.stat().st_mtime_ns
+    if mtime != fleet_summary["mtime"]:
+        fleet_summary["data"] = json.loads(SUMMARY_FILE.read_text())
+        fleet_summary["mtime"] = mtime
+
+    return fleet_summary["data"]
+
+
 @app.get("/api/dashboard/summary")
 async def get_dashboard_summary():
     """Get summary data for dashboard."""
-    hosts_response = await list_hosts()
-    hosts = hosts_response["hosts"]
-
-    summary = {
-        "total_hosts": len(hosts),
-        "hosts_by_group": {},
-        "recent_changes": [],
-        "total_configs": 0,
-        "total_changes": 0
-    }
+    # Refreshes the inventory cache if the inventory or host/group vars changed
+    await list_hosts()
+    hosts_by_group = inventory_cache["hosts_by_group"]
+    data = load_fleet_summary()
 
-    # Count hosts by group
-    for host in hosts:
-        group = host["group"]
-        summary["hosts_by_group"][group] = summary["hosts_by_group"].get(group, 0) + 1
-
-    # Count total configs
-    summary["total_configs"] = len(list(CONFIG_DIR.glob("*.json")))
-
-    # Count total changes
-    summary["total_changes"] = len(list(CHANGES_DIR.glob("*.diff")))
-
-    # Get recent changes (last 10)
-    change_files = sorted(CHANGES_DIR.glob("*.diff"), key=lambda x: x.stat().st_mtime, reverse=True)[:10]
-    for f in change_files:
-        match = re.match(r'(.+)_change_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.diff$', f.name)
-        if match:
-            summary["recent_changes"].append({
-                "hostname": match.group(1),
-                "timestamp": match.group(2),
-                "filename": f.name
-            })
-
-    return summary
+    return {
+        "total_hosts": sum(hosts_by_group.values()),
+        "hosts_by_group": hosts_by_group,
+        "recent_changes": data["recent_changes"],
+        "total_configs": data["total_configs"],
+        "total_changes": data["total_changes"],
+        "failure_reasons": data["failure_reasons"],
+        "hosts": data["hosts"],
+        "updated_at": data["updated_at"]
+    }
 
 
 if __name__ == "__main__":
@@ -76,7 +76,7 @@ function App() {
 
   const fetchConfig = async (hostname) => {
     try {
-      const response = await fetch(`${API_BASE}/configs/${hostname}/latest`)
+      const response = await fetch(`${API_BASE}/configs/${hostname}/latest/outline`)
       if (response.ok) {
         const data = await response.json()
         setConfigData(data)
@@ -91,7 +91,7 @@ function App() {
 
   const fetchChanges = async (hostname) => {
     try {
-      const response = await fetch(`${API_BASE}/changes/${hostname}/latest`)
+      const response = await fetch(`${API_BASE}/changes/${hostname}/latest/outline`)
       if (response.ok) {
         const data = await response.json()
         setChangeData(data)
@@ -316,6 +316,22 @@ function App() {
           </div>
         )}
 
+        {/* Fleet Failure Reasons */}
+        {summary && summary.failure_reasons && Object.keys(summary.failure_reasons).length > 0 && (
+          <div className="mt-6 bg-white rounded-lg shadow p-6">
+            <h2 className="text-lg font-semibold text-gray-900 mb-4">Collection Failures</h2>
+            <div className="flex flex-wrap gap-3">
+              {Object.entries(summary.failure_reasons).map(([reason, count]) => (
+                <div key={reason} className="flex items-center gap-2 px-3 py-2 bg-red-50 rounded-lg">
+                  <AlertCircle className="h-4 w-4 text-red-600" />
+                  <span className="text-red-700 font-medium">{reason.replace('_', ' ')}</span>
+                  <span className="text-sm text-red-500">{count}</span>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
         {/* Recent Changes */}
         {summary && summary.recent_changes.length > 0 && (
           <div className="mt-6 bg-white rounded-lg shadow p-6">
@@ -1,5 +1,8 @@
 import React, { useState } from 'react'
 import { ChevronDown, ChevronRight, FileText, Clock, Copy, Check } from 'lucide-react'
+import VirtualLines from './VirtualLines'
+
+const API_BASE = '/api'
 
 function ConfigDashboard({ hostname, configData }) {
   const [expandedSections, setExpandedSections] = useState({})
@@ -28,8 +31,26 @@ function ConfigDashboard({ hostname, configData }) {
     }))
   }
 
-  const copyToClipboard = async (content, title) => {
+  const sectionUrl = (title) =>
+    `${API_BASE}/configs/${hostname}/latest/lines?section=${encodeURIComponent(title)}`
+
+  // Copying needs the whole section, fetched in large windows
+  const fetchAllLines = async (url, total) => {
+    const lines = []
+    while (lines.length < total) {
+      const response = await fetch(`${url}&offset=${lines.length}&limit=5000`)
+      if (!response.ok) throw new Error('Failed to load section')
+      const data = await response.json()
+      if (data.lines.length === 0) break
+      lines.push(...data.lines)
+    }
+    return lines.join('\n')
+  }
+
+  const copyToClipboard = async (section) => {
+    const title = section.title
     try {
+      const content = await fetchAllLines(sectionUrl(title), section.count)
       await navigator.clipboard.writeText(content)
       setCopiedSection(title)
       setTimeout(() => setCopiedSection(null), 2000)
@@ -78,12 +99,12 @@ function ConfigDashboard({ hostname, configData }) {
               </div>
               <div className="flex items-center gap-2">
                 <span className="text-xs text-gray-400">
-                  {section.content.split('\n').length} lines
+                  {section.count} lines
                 </span>
                 <button
                   onClick={(e) => {
                     e.stopPropagation()
-                    copyToClipboard(section.content, section.title)
+                    copyToClipboard(section)
                   }}
                   className="p-1 hover:bg-gray-200 rounded"
                   title="Copy section"
@@ -98,8 +119,12 @@ function ConfigDashboard({ hostname, configData }) {
             </button>
 
             {expandedSections[section.title] && (
-              <div className="p-4 bg-gray-900 text-gray-100 font-mono text-xs overflow-x-auto max-h-96 overflow-y-auto">
-                <pre className="whitespace-pre-wrap">{section.content}</pre>
+              <div className="py-2 bg-gray-900 text-gray-100">
+                <VirtualLines
+                  key={configData.filename}
+                  url={sectionUrl(section.title)}
+                  total={section.count}
+                />
               </div>
             )}
           </div>
@@ -107,13 +132,18 @@ function ConfigDashboard({ hostname, configData }) {
       </div>
 
       {/* Show raw config if no sections parsed */}
-      {(!configData.sections || configData.sections.length === 0) && configData.content && (
+      {(!configData.sections || configData.sections.length === 0) && configData.line_count > 0 && (
         <div className="border rounded-lg overflow-hidden">
           <div className="px-4 py-3 bg-gray-50 font-medium text-gray-700">
             Raw Configuration
           </div>
-          <div className="p-4 bg-gray-900 text-gray-100 font-mono text-xs overflow-x-auto max-h-[500px] overflow-y-auto">
-            <pre className="whitespace-pre-wrap">{configData.content}</pre>
+          <div className="py-2 bg-gray-900 text-gray-100">
+            <VirtualLines
+              key={configData.filename}
+              url={`${API_BASE}/configs/${hostname}/latest/lines`}
+              total={configData.line_count}
+              height={500}
+            />
           </div>
         </div>
       )}
@@ -1,5 +1,15 @@
 import React, { useState } from 'react'
 import { GitCompare, Clock, Plus, Minus, ChevronDown, ChevronRight } from 'lucide-react'
+import VirtualLines from './VirtualLines'
+
+const API_BASE = '/api'
+
+const rawLineClass = (line) => {
+  if (line.startsWith('+') && !line.startsWith('+++')) return 'text-green-400 bg-green-900/30'
+  if (line.startsWith('-') && !line.startsWith('---')) return 'text-red-400 bg-red-900/30'
+  if (line.startsWith('@@')) return 'text-blue-400'
+  return 'text-gray-300'
+}
 
 function DiffViewer({ hostname, changeData }) {
   const [showRaw, setShowRaw] = useState(false)
@@ -25,7 +35,7 @@ function DiffViewer({ hostname, changeData }) {
     return ts.replace('_', ' ')
   }
 
-  const { diff } = changeData
+  const linesUrl = (stream) => `${API_BASE}/changes/${hostname}/latest/lines?stream=${stream}`
 
   return (
     <div className="p-6">
@@ -44,11 +54,11 @@ function DiffViewer({ hostname, changeData }) {
       <div className="flex gap-4 mb-4">
         <div className="flex items-center gap-2 px-3 py-2 bg-green-50 rounded-lg">
           <Plus className="h-4 w-4 text-green-600" />
-          <span className="text-green-700 font-medium">{diff.additions_count} additions</span>
+          <span className="text-green-700 font-medium">{changeData.additions_count} additions</span>
         </div>
         <div className="flex items-center gap-2 px-3 py-2 bg-red-50 rounded-lg">
           <Minus className="h-4 w-4 text-red-600" />
-          <span className="text-red-700 font-medium">{diff.removals_count} removals</span>
+          <span className="text-red-700 font-medium">{changeData.removals_count} removals</span>
         </div>
       </div>
 
@@ -68,66 +78,60 @@ function DiffViewer({ hostname, changeData }) {
       </div>
 
       {/* Visual Diff */}
-      <div className="space-y-4 max-h-[500px] overflow-y-auto">
+      <div className="space-y-4">
         {/* Removals */}
-        {diff.removals.length > 0 && (
+        {changeData.removals_count > 0 && (
           <div className="border border-red-200 rounded-lg overflow-hidden">
             <div className="px-4 py-2 bg-red-50 font-medium text-red-700 flex items-center gap-2">
               <Minus className="h-4 w-4" />
-              Removed Lines ({diff.removals.length})
+              Removed Lines ({changeData.removals_count})
             </div>
-            <div className="p-3 bg-red-50/30 font-mono text-xs overflow-x-auto max-h-48 overflow-y-auto">
-              {diff.removals.map((line, idx) => (
-                <div key={idx} className="px-2 py-1 bg-red-100 border-l-2 border-red-500 mb-1 text-red-800">
-                  {line || <span className="text-gray-400 italic">(empty line)</span>}
-                </div>
-              ))}
+            <div className="py-2 bg-red-50/30">
+              <VirtualLines
+                key={changeData.filename}
+                url={linesUrl('removals')}
+                total={changeData.removals_count}
+                height={192}
+                lineClassName={() => 'bg-red-100 border-l-2 border-red-500 text-red-800'}
+              />
             </div>
           </div>
         )}
 
         {/* Additions */}
-        {diff.additions.length > 0 && (
+        {changeData.additions_count > 0 && (
           <div className="border border-green-200 rounded-lg overflow-hidden">
             <div className="px-4 py-2 bg-green-50 font-medium text-green-700 flex items-center gap-2">
               <Plus className="h-4 w-4" />
-              Added Lines ({diff.additions.length})
+              Added Lines ({changeData.additions_count})
             </div>
-            <div className="p-3 bg-green-50/30 font-mono text-xs overflow-x-auto max-h-48 overflow-y-auto">
-              {diff.additions.map((line, idx) => (
-                <div key={idx} className="px-2 py-1 bg-green-100 border-l-2 border-green-500 mb-1 text-green-800">
-                  {line || <span className="text-gray-400 italic">(empty line)</span>}
-                </div>
-              ))}
+            <div className="py-2 bg-green-50/30">
+              <VirtualLines
+                key={changeData.filename}
+                url={linesUrl('additions')}
+                total={changeData.additions_count}
+                height={192}
+                lineClassName={() => 'bg-green-100 border-l-2 border-green-500 text-green-800'}
+              />
             </div>
           </div>
         )}
       </div>
 
       {/* Raw Diff */}
-      {showRaw && changeData.content && (
+      {showRaw && changeData.line_count > 0 && (
         <div className="mt-4 border rounded-lg overflow-hidden">
           <div className="px-4 py-2 bg-gray-100 font-medium text-gray-700">
             Raw Diff Output
           </div>
-          <div className="p-4 bg-gray-900 font-mono text-xs overflow-x-auto max-h-[400px] overflow-y-auto">
-            <pre className="whitespace-pre-wrap">
-              {changeData.content.split('\n').map((line, idx) => {
-                let className = 'text-gray-300'
-                if (line.startsWith('+') && !line.startsWith('+++')) {
-                  className = 'text-green-400 bg-green-900/30'
-                } else if (line.startsWith('-') && !line.startsWith('---')) {
-                  className = 'text-red-400 bg-red-900/30'
-                } else if (line.startsWith('@@')) {
-                  className = 'text-blue-400'
-                }
-                return (
-                  <div key={idx} className={className}>
-                    {line}
-                  </div>
-                )
-              })}
-            </pre>
+          <div className="py-2 bg-gray-900">
+            <VirtualLines
+              key={changeData.filename}
+              url={linesUrl('all')}
+              total={changeData.line_count}
+              height={400}
+              lineClassName={rawLineClass}
+            />
           </div>
         </div>
       )}
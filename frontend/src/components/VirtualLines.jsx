@@ -0,0 +1,76 @@
+import React, { useState, useEffect, useRef, useCallback } from 'react'
+
+const ROW_HEIGHT = 18
+const PAGE_SIZE = 200
+const OVERSCAN = 20
+
+// Renders only the visible rows of a large line list, fetching pages of
+// lines from the API as they scroll into view.
+function VirtualLines({ url, total, height = 384, className = '', lineClassName }) {
+  const [scrollTop, setScrollTop] = useState(0)
+  const [pages, setPages] = useState({})
+  const loading = useRef(new Set())
+
+  // Reset when the source changes
+  useEffect(() => {
+    setPages({})
+    setScrollTop(0)
+    loading.current = new Set()
+  }, [url])
+
+  const loadPage = useCallback(async (page) => {
+    if (loading.current.has(page)) return
+    loading.current.add(page)
+    try {
+      const sep = url.includes('?') ? '&' : '?'
+      const response = await fetch(`${url}${sep}offset=${page * PAGE_SIZE}&limit=${PAGE_SIZE}`)
+      if (!response.ok) throw new Error('Failed to load lines')
+      const data = await response.json()
+      setPages(prev => ({ ...prev, [page]: data.lines }))
+    } catch (err) {
+      console.error(err)
+      loading.current.delete(page)
+    }
+  }, [url])
+
+  const first = Math.max(0, Math.floor(scrollTop / ROW_HEIGHT) - OVERSCAN)
+  const last = Math.min(total, Math.ceil((scrollTop + height) / ROW_HEIGHT) + OVERSCAN)
+
+  useEffect(() => {
+    if (total === 0) return
+    const firstPage = Math.floor(first / PAGE_SIZE)
+    const lastPage = Math.floor(Math.max(first, last - 1) / PAGE_SIZE)
+    for (let page = firstPage; page <= lastPage; page++) {
+      if (!pages[page]) loadPage(page)
+    }
+  }, [first, last, total, pages, loadPage])
+
+  const rows = []
+  for (let idx = first; idx < last; idx++) {
+    const page = pages[Math.floor(idx / PAGE_SIZE)]
+    const line = page ? page[idx % PAGE_SIZE] : undefined
+    rows.push(
+      <div
+        key={idx}
+        className={`absolute left-0 right-0 whitespace-pre px-2 ${line !== undefined && lineClassName ? lineClassName(line) : ''}`}
+        style={{ top: idx * ROW_HEIGHT, height: ROW_HEIGHT, lineHeight: `${ROW_HEIGHT}px` }}
+      >
+        {line === undefined ? <span className="text-gray-500">...</span> : (line || ' ')}
+      </div>
+    )
+  }
+
+  return (
+    <div
+      className={`relative overflow-auto font-mono text-xs ${className}`}
+      style={{ height: Math.min(height, Math.max(total, 1) * ROW_HEIGHT) }}
+      onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+    >
+      <div className="relative" style={{ height: total * ROW_HEIGHT }}>
+        {rows}
+      </div>
+    </div>
+  )
+}
+
+export default VirtualLines
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Config diff memory benchmark
+
+Generates pairs of large synthetic configs and measures peak Python memory
+(tracemalloc), time and diff size for:
+- in-memory: read both files, filter, split and materialize unified_diff
+  (how diff_and_cleanup() used to work)
+- streaming: write_streaming_diff() as used by diff_and_cleanup()
+
+Cases: a few scattered one-line changes, and a block insert and a block
+delete larger than DIFF_MATCH_WINDOW (both sides must line up again after
+the block).
+
+Exits non-zero if the streaming diff's peak exceeds --max-peak-mb, if it
+has more changed lines than difflib's, or if it is more than
+--max-slowdown times slower than the in-memory diff.
+
+Only the diff itself is measured: diff_and_cleanup() then stores the new
+config in the history delta chain (append_history()), which still loads
+both versions.
+
+Usage:
+    python scripts/bench_diff.py [--lines N] [--changes N] [--block N] [--max-peak-mb MB] [--max-slowdown X]
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from difflib import unified_diff
+
+sys.path.insert(0, str(Path(__file__).parent))
+import orchestrator  # noqa: E402
+
+
+def make_config(lines):
+    """Config-like lines: unique interface headers, repeated body lines.
+
+    Only four VLANs are used so every body line is common enough for
+    difflib's autojunk, which keeps the in-memory baseline tractable.
+    """
+    config = []
+    for i in range(lines):
+        if i % 8 == 0:
+            config.append(f"interface Ethernet{i // 8 // 48 + 1}/{i // 8 % 48 + 1}")
+        else:
+            config.append([
+                "  description access port",
+                "  no shutdown",
+                "  switchport mode access",
+                f"  switchport access vlan {i // 8 % 4 + 10}",
+                "  spanning-tree portfast",
+                "!",
+                "!",
+            ][i % 8 - 1])
+    return config
+
+
+def make_acl(lines):
+    """Block of ACL lines to insert, with the same `!` separators as the config."""
+    return [
+        "!" if k % 10 == 9 else f"  permit tcp any host 10.{k // 65536 % 256}.{k // 256 % 256}.{k % 256} eq 443"
+        for k in range(lines)
+    ]
+
+
+def write_configs(directory, prev, new):
+    """Write a previous/new config pair; returns their paths."""
+    prev_file = directory / "bench_2026-01-01_00-00-00.json"
+    prev_file.write_text("=== Running Configuration ===\n" + "\n".join(prev) + "\n")
+    new_file = directory / "bench_2026-01-01_01-00-00.json"
+    new_file.write_text("=== Running Configuration ===\n" + "\n".join(new) + "\n")
+    return prev_file, new_file
+
+
+def make_cases(lines, changes, block):
+    """(label, previous lines, new lines) for each benchmark case."""
+    random.seed(0)
+    config = make_config(lines)
+
+    scattered = list(config)
+    for _ in range(changes):
+        scattered[random.randrange(len(scattered))] = f"  description changed {random.random()}"
+
+    middle = lines // 2
+    return [
+        (f"{changes} scattered changes", config, scattered),
+        (f"{block}-line block insert", config, config[:middle] + make_acl(block) + config[middle:]),
+        (f"{block}-line block delete", config, config[:middle] + config[middle + block:]),
+    ]
+
+
+def in_memory_diff(prev_file, new_file, diff_file):
+    """The previous whole-file diff implementation."""
+    prev_content = orchestrator.filter_ignore_lines(prev_file.read_text())
+    new_content = orchestrator.filter_ignore_lines(new_file.read_text())
+    diff_lines = list(unified_diff(
+        prev_content.splitlines(keepends=True),
+        new_content.splitlines(keepends=True),
+        fromfile=prev_file.name,
+        tofile=new_file.name,
+    ))
+    with open(diff_file, "w") as f:
+        f.writelines(diff_lines)
+
+
+def changed_lines(diff_file):
+    """Number of +/- lines in a unified diff file."""
+    with open(diff_file) as f:
+        return sum(1 for line in f if line[:1] in "+-" and not line.startswith(("+++", "---")))
+
+
+def measure(func, *args):
+    """Run func twice, returning (peak MB, seconds); timed without tracemalloc's overhead."""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Config diff memory benchmark")
+    parser.add_argument("--lines", type=int, default=200000, help="Lines per config")
+    parser.add_argument("--changes", type=int, default=20, help="Scattered changed lines")
+    parser.add_argument("--block", type=int, default=3 * orchestrator.DIFF_MATCH_WINDOW,
+                        help="Lines inserted/deleted in the block cases")
+    parser.add_argument("--max-peak-mb", type=float, default=32.0, help="Peak memory cap for the streaming diff")
+    parser.add_argument("--max-slowdown", type=float, default=3.0,
+                        help="Allowed streaming/in-memory time ratio")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for label, prev, new in make_cases(args.lines, args.changes, args.block):
+            prev_file, new_file = write_configs(directory, prev, new)
+            size_mb = new_file.stat().st_size / (1024 * 1024)
+            print(f"{label} ({args.lines} lines, {size_mb:.1f} MB):")
+
+            a_diff, b_diff = directory / "a.diff", directory / "b.diff"
+            a_peak, a_elapsed = measure(in_memory_diff, prev_file, new_file, a_diff)
+            a_lines = changed_lines(a_diff)
+            print(f"  in-memory:  peak {a_peak:7.1f} MB  {a_elapsed:6.2f} s  {a_lines:7} changed lines")
+
+            b_peak, b_elapsed = measure(orchestrator.write_streaming_diff, prev_file, new_file, b_diff, "")
+            b_lines = changed_lines(b_diff)
+            print(f"  streaming:  peak {b_peak:7.1f} MB  {b_elapsed:6.2f} s  {b_lines:7} changed lines")
+
+            if b_peak > args.max_peak_mb:
+                failures.append(f"{label}: streaming peak {b_peak:.1f} MB exceeds cap of {args.max_peak_mb:.1f} MB")
+            if b_lines > a_lines:
+                failures.append(f"{label}: streaming diff has {b_lines} changed lines, difflib {a_lines}")
+            if b_elapsed > args.max_slowdown * a_elapsed:
+                failures.append(f"{label}: streaming took {b_elapsed:.2f} s, in-memory {a_elapsed:.2f} s")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: streaming peak within {args.max_peak_mb:.1f} MB cap, diffs no larger than difflib's")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Config retrieval benchmark
+
+Times the previous and current retrieval command sets against recorded
+device output replayed by fake_device.py:
+- FortiGate: `show full-configuration` through the pager, reading until the
+  session goes quiet (the previous fortigate_ssh.py), vs fortigate_ssh.py's
+  `show`, paged through and read up to the prompt
+- IOS: seven show commands vs the change-marker check plus the six tables,
+  with and without the running config pull
+- NX-OS: text tables vs `| json` tables
+
+Cisco sessions are driven like network_cli: `terminal length 0`, then one
+command at a time, each read up to the prompt. The sample recordings under
+scripts/recordings/ are synthetic; drop captures from real devices in
+(same file naming) to time those instead. The FortiGate configs are
+generated here at benchmark size (--fortigate-objects) on top of the
+sample recording's other commands.
+
+Usage:
+    python scripts/bench_retrieval.py [--runs N] [--latency-ms MS] [--kbps KIB] [--fortigate-objects N]
+"""
+
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+import paramiko
+
+sys.path.insert(0, str(Path(__file__).parent))
+import fake_device  # noqa: E402
+import fortigate_ssh  # noqa: E402
+
+CISCO_PROMPT = re.compile(r"[\w.-]+(?:\(config[^)]*\))?#$")
+
+IOS_TABLES = [
+    "show interface status",
+    "show vlan brief",
+    "show arp summary",
+    "show etherchannel summary",
+    "show ip interface brief | exclude unassigned",
+    "show ip route summary",
+]
+
+NXOS_TABLES = [
+    "show interface status",
+    "show vlan brief",
+    "show port-channel summary",
+    "show ip interface brief vrf all",
+    "show ip route summary vrf all",
+]
+
+
+def fortigate_config(objects, defaults):
+    """Synthetic FortiGate config sized by its number of firewall addresses.
+
+    defaults is the number of default settings listed per entry: 0 gives
+    `show` output (non-default settings only), more gives `show
+    full-configuration`, which also lists every default.
+    """
+    lines = [
+        "#config-version=FGT60F-7.2.5-FW-build1517-230606:opmode=0:vdom=0:user=admin",
+        "#conf_file_ver=48291033872211",
+        "#buildno=1517",
+        "#global_vdom=1",
+    ]
+
+    def section(title, entries, indent="    "):
+        lines.append(f"config {title}")
+        for name, settings in entries:
+            if name is not None:
+                lines.append(f"    edit {name}")
+            lines.extend(f"{indent}set {setting}" for setting in settings)
+            lines.extend(f"{indent}set option-{n} enable" for n in range(defaults))
+            if name is not None:
+                lines.append("    next")
+        lines.append("end")
+
+    interfaces = max(1, objects // 5)
+    section("system global", [(None, ['alias "FGT60F-LAB"', 'hostname "FGT60F-LAB"', "timezone 12"])])
+    section("system accprofile", [
+        (f'"prof_{n}"', ["secfabgrp read-write", "ftviewgrp read-write"]) for n in range(4)
+    ], indent="        ")
+    section("system interface", [
+        (f'"port{n}"', [f"ip 10.{n}.0.1 255.255.255.0", "allowaccess ping https ssh", "type physical"])
+        for n in range(1, interfaces + 1)
+    ], indent="        ")
+    section("firewall address", [
+        (f'"host_{n}"', [f"subnet 192.168.{n // 254}.{n % 254 + 1} 255.255.255.255"]) for n in range(objects)
+    ], indent="        ")
+    section("firewall addrgrp", [
+        (f'"grp_{n}"', ["member " + " ".join(f'"host_{m}"' for m in range(n * 10, min(objects, n * 10 + 10)))])
+        for n in range(max(1, objects // 10))
+    ], indent="        ")
+    section("firewall service custom", [
+        (f'"svc_{8000 + n}"', [f"tcp-portrange {8000 + n}"]) for n in range(max(1, objects // 5))
+    ], indent="        ")
+    section("firewall policy", [
+        (n, [f'name "policy_{n}"', 'srcintf "port1"', 'dstintf "port2"',
+             f'srcaddr "grp_{n % max(1, objects // 10)}"', 'dstaddr "all"', "action accept",
+             'schedule "always"', f'service "svc_{8000 + n % max(1, objects // 5)}"', "nat enable"])
+        for n in range(1, objects * 2 // 5 + 1)
+    ], indent="        ")
+    section("router static", [
+        (n, [f"dst 10.{100 + n}.0.0 255.255.0.0", "gateway 10.1.0.254", 'device "port1"'])
+        for n in range(1, max(1, objects * 2 // 15) + 1)
+    ], indent="        ")
+
+    # Sections left at their defaults only appear in full-configuration
+    if defaults:
+        for title in ("log fortianalyzer setting", "log syslogd setting", "system dns", "system ntp",
+                      "system fortiguard", "system settings", "system ha", "wireless-controller setting",
+                      "switch-controller global", "ips global"):
+            section(title, [(None, [])])
+
+    return "\n".join(lines) + "\n"
+
+
+def fortigate_recording(directory, objects):
+    """Copy the sample FortiGate recording into directory with generated configs."""
+    shutil.copytree(fake_device.RECORDINGS_DIR / "fortigate", directory, dirs_exist_ok=True)
+    (directory / "show.txt").write_text(fortigate_config(objects, 0))
+    (directory / "show_full-configuration.txt").write_text(fortigate_config(objects, 20))
+    return directory
+
+
+class CountingShell:
+    """Channel wrapper counting the bytes received."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.received = 0
+
+    def recv(self, size):
+        data = self.channel.recv(size)
+        self.received += len(data)
+        return data
+
+    def send(self, data):
+        return self.channel.send(data)
+
+    def settimeout(self, timeout):
+        self.channel.settimeout(timeout)
+
+
+def open_shell(port):
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    ssh.connect("127.0.0.1", port=port, username="admin", password="admin", look_for_keys=False, allow_agent=False)
+    return ssh, CountingShell(ssh.invoke_shell())
+
+
+def read_cisco_prompt(shell):
+    """Read until the output ends with a Cisco prompt."""
+    output = ""
+    while not CISCO_PROMPT.search(output.rstrip("\r\n").rsplit("\n", 1)[-1]):
+        data = shell.recv(65536).decode(errors="replace")
+        if not data:
+            break
+        output += data
+
+
+def cisco_session(port, commands):
+    """network_cli-style session: disable paging, then one command per round trip."""
+    ssh, shell = open_shell(port)
+    read_cisco_prompt(shell)
+    for command in ["terminal length 0", "terminal width 511"] + commands:
+        shell.send(command + "\r")
+        read_cisco_prompt(shell)
+    ssh.close()
+    return shell.received
+
+
+def legacy_fortigate(port):
+    """The previous fortigate_ssh.py flow: page through, read until quiet."""
+    def recv_until_timeout(shell, timeout=5):
+        shell.settimeout(timeout)
+        output = ""
+        while True:
+            try:
+                data = shell.recv(1024).decode("utf-8")
+                if not data:
+                    break
+                output += data
+                if "--More--" in data:
+                    shell.send(" ")
+            except Exception:
+                break
+        return output
+
+    ssh, shell = open_shell(port)
+    shell.send("get system status\n")
+    recv_until_timeout(shell)
+    shell.send("show full-configuration\n")
+    recv_until_timeout(shell, timeout=30)
+    ssh.close()
+    return shell.received
+
+
+def current_fortigate(port):
+    ssh, shell = open_shell(port)
+    fortigate_ssh.fetch_configuration(shell)
+    ssh.close()
+    return shell.received
+
+
+def measure(func, port, runs):
+    """Median wall time (ms) and bytes received of a retrieval."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        received = func(port)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), received
+
+
+def report(label, result):
+    elapsed, received = result
+    print(f"  {label:<40} {elapsed:9.1f} ms  {received / 1024:8.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Config retrieval benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Fake device delay before each reply")
+    parser.add_argument("--kbps", type=float, default=512, help="Fake device output rate in KiB/s")
+    parser.add_argument("--skip-legacy-fortigate", action="store_true",
+                        help="Skip the previous FortiGate flow (it waits out 35 s of idle timeouts)")
+    parser.add_argument("--fortigate-objects", type=int, default=300,
+                        help="Firewall addresses in the generated FortiGate config (sizes the other tables)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_benchmarks(args, fortigate_recording(Path(tmp) / "fortigate", args.fortigate_objects))
+
+
+def run_benchmarks(args, fortigate_dir):
+    latency, rate = args.latency_ms / 1000, args.kbps * 1024
+    ports = {
+        name: fake_device.start_device(fake_device.RECORDINGS_DIR / name, 0, latency, rate)
+        for name in ("ios", "nxos")
+    }
+    ports["fortigate"] = fake_device.start_device(fortigate_dir, 0, latency, rate)
+    print(f"Fake devices: {args.latency_ms:.0f} ms per reply, {args.kbps:.0f} KiB/s\n")
+
+    print("FortiGate:")
+    if not args.skip_legacy_fortigate:
+        report("show full-configuration (paged, idle)", measure(legacy_fortigate, ports["fortigate"], 1))
+    report("show (paged, read to prompt)", measure(current_fortigate, ports["fortigate"], args.runs))
+
+    print("\nIOS:")
+    report("7 commands incl. running-config", measure(
+        lambda port: cisco_session(port, IOS_TABLES + ["show running-config"]), ports["ios"], args.runs))
+    report("marker + tables, config changed", measure(
+        lambda port: cisco_session(port, ["show running-config | include Last configuration change"]
+                                   + IOS_TABLES + ["show running-config"]), ports["ios"], args.runs))
+    report("marker + tables, config unchanged", measure(
+        lambda port: cisco_session(port, ["show running-config | include Last configuration change"]
+                                   + IOS_TABLES), ports["ios"], args.runs))
+
+    print("\nNX-OS:")
+    report("text tables + running-config", measure(
+        lambda port: cisco_session(port, NXOS_TABLES + ["show running-config"]), ports["nxos"], args.runs))
+    report("| json tables + running-config", measure(
+        lambda port: cisco_session(port, [f"{command} | json" for command in NXOS_TABLES]
+                                   + ["show running-config"]), ports["nxos"], args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Per-job collection overhead benchmark
+
+Runs real collection jobs (run_collection_job) with a local-connection
+debug playbook, so no device is contacted, and compares:
+- subprocess: a fresh interpreter per job that shells out to
+  ansible-inventory and ansible-playbook (what the backend did before
+  worker processes, and what workers still do without Ansible's Python API)
+- in-process: jobs submitted to a warm worker (as the backend does), where
+  Ansible and the inventory were loaded once by init_worker()
+
+Every job must report a successful playbook run; otherwise the job's output
+is printed and the benchmark exits non-zero. Output files go to a scratch
+directory, not output/.
+
+Usage:
+    python scripts/bench_startup.py [--runs N] [--host HOST]
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent))
+import orchestrator  # noqa: E402
+
+# Play vars override the hosts' network_cli connection and enable mode
+BENCH_PLAYBOOK = """\
+- name: Startup benchmark
+  hosts: all
+  gather_facts: no
+  vars:
+    ansible_connection: local
+    ansible_become: no
+  tasks:
+    - name: Report host
+      ansible.builtin.debug:
+        msg: "collected {{ inventory_hostname }}"
+"""
+
+
+def use_scratch(root):
+    """Point the orchestrator's playbook and output paths into root."""
+    root = Path(root)
+    orchestrator.PLAYBOOK = root / "bench.yml"
+    orchestrator.CONFIG_DIR = root / "configs"
+    orchestrator.CHANGES_DIR = root / "changes"
+    orchestrator.LOG_DIR = root / "logs"
+    orchestrator.SUMMARY_FILE = root / "summary.json"
+    orchestrator.HISTORY_DIR = root / "history"
+    orchestrator.CHANGESETS_FILE = root / "changesets.json"
+    orchestrator.INDEX_DIR = root / "index"
+    orchestrator.EVENTS_DIR = root / "events"
+    orchestrator.CACHE_DIR = root / "cache"
+
+
+def init_bench_worker(root):
+    use_scratch(root)
+    orchestrator.init_worker()
+
+
+def collection_job(host):
+    """Run one collection; returns (playbook succeeded, in-process, output)."""
+    ok, output, error = orchestrator.run_collection_job(host)
+    succeeded = ok and "[OK] Playbook succeeded" in output
+    return succeeded, orchestrator.worker_state["in_process"], output
+
+
+def cold_job(root, host):
+    """Entry point for the per-job subprocess."""
+    use_scratch(root)
+    orchestrator.worker_state["in_process"] = False
+    succeeded, _, output = collection_job(host)
+    if not succeeded:
+        print(output)
+    sys.exit(0 if succeeded else 1)
+
+
+def check(succeeded, output, label):
+    if not succeeded:
+        print(output)
+        print(f"FAIL: {label} job did not run the playbook successfully")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-job collection overhead benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Jobs per measurement")
+    parser.add_argument("--host", help="Inventory host to run against (default: first host)")
+    args = parser.parse_args()
+
+    host = args.host or orchestrator.get_hosts()[0]
+
+    with tempfile.TemporaryDirectory() as root:
+        (Path(root) / "bench.yml").write_text(BENCH_PLAYBOOK)
+        print(f"Host: {host}\n")
+
+        print("Subprocess path (per job):")
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, __file__, "--cold-job", root, host],
+                capture_output=True, text=True,
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+            check(result.returncode == 0, result.stdout + result.stderr, "subprocess")
+        print(f"  per job:                        {statistics.median(timings):8.1f} ms")
+
+        print("\nIn-process path (warm worker):")
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_bench_worker,
+            initargs=(root,),
+        ) as pool:
+            start = time.perf_counter()
+            succeeded, in_process, output = pool.submit(collection_job, host).result()
+            print(f"  worker start + first job:       {(time.perf_counter() - start) * 1000:8.1f} ms")
+            check(succeeded, output, "in-process")
+
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                succeeded, in_process, output = pool.submit(collection_job, host).result()
+                timings.append((time.perf_counter() - start) * 1000)
+                check(succeeded, output, "in-process")
+            print(f"  per job:                        {statistics.median(timings):8.1f} ms")
+
+    if not in_process:
+        print("\nNote: Ansible's Python API is not importable here; workers fall back")
+        print("to running ansible-playbook as a subprocess for each job.")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--cold-job"]:
+        cold_job(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Fake network device
+
+Serves recorded CLI output over SSH so retrieval can be timed without real
+hardware. A recording is a directory holding device.json
+({"hostname", "platform", "pager_lines"}) and one text file per command,
+named after the command with runs of other characters replaced by "_"
+(`show running-config | include Last` -> show_running-config_include_Last.txt).
+
+The device echoes input as its CLI reads it, pages output with --More--
+until the pager is turned off (`terminal length 0` on Cisco, `set output
+standard` under `config system console` on FortiGate), tracks config-mode
+prompts, and waits --latency-ms before each reply and sends it no faster
+than --kbps.
+
+Usage:
+    python scripts/fake_device.py scripts/recordings/fortigate [--port 2222] [--latency-ms 50] [--kbps 512]
+"""
+
+import re
+import json
+import time
+import socket
+import argparse
+import threading
+from pathlib import Path
+
+import paramiko
+
+RECORDINGS_DIR = Path(__file__).parent / "recordings"
+
+SEND_CHUNK = 4096
+
+# Cisco-style error for commands without a recording
+INVALID_INPUT = "% Invalid input detected at '^' marker."
+FORTIGATE_INVALID = "Unknown action 0\nCommand fail. Return code -1"
+
+
+def recording_file(recording, command):
+    """Path of the recorded output for a command."""
+    name = re.sub(r"[^\w.-]+", "_", command).strip("_")
+    return recording / f"{name}.txt"
+
+
+class DeviceServer(paramiko.ServerInterface):
+    """Accepts any password and a single interactive shell."""
+
+    def __init__(self):
+        self.shell_requested = threading.Event()
+
+    def check_auth_password(self, username, password):
+        return paramiko.AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED_OPEN_REQUEST
+
+    def check_channel_pty_request(self, channel, term, width, height, pixelwidth, pixelheight, modes):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        self.shell_requested.set()
+        return True
+
+
+class CliSession:
+    """One client's CLI: line reading, prompts, paging and replay."""
+
+    def __init__(self, channel, recording, latency, rate):
+        self.channel = channel
+        self.recording = recording
+        self.latency = latency
+        self.rate = rate
+        self.device = json.loads((recording / "device.json").read_text())
+        self.fortigate = self.device["platform"] == "fortigate"
+        self.pager = True
+        self.context = []
+        self.pending = ""
+
+    def prompt(self):
+        hostname = self.device["hostname"]
+        if not self.fortigate:
+            return f"{hostname}(config)#" if self.context else f"{hostname}#"
+        if self.context:
+            return f"{hostname} ({self.context[-1]}) # "
+        return f"{hostname} # "
+
+    def read_char(self):
+        """Next input character, or None once the client has gone."""
+        while not self.pending:
+            data = self.channel.recv(1024)
+            if not data:
+                return None
+            self.pending += data.decode(errors="replace")
+        char, self.pending = self.pending[0], self.pending[1:]
+        return char
+
+    def read_line(self):
+        """Next input line (CR, LF or CRLF terminated)."""
+        line = ""
+        while True:
+            char = self.read_char()
+            if char is None:
+                return None
+            if char in "\r\n":
+                if char == "\r" and self.pending.startswith("\n"):
+                    self.pending = self.pending[1:]
+                return line
+            line += char
+
+    def send(self, text):
+        """Send text no faster than the configured rate."""
+        data = text.replace("\r\n", "\n").replace("\n", "\r\n").encode()
+        for pos in range(0, len(data), SEND_CHUNK):
+            chunk = data[pos:pos + SEND_CHUNK]
+            self.channel.sendall(chunk)
+            if self.rate:
+                time.sleep(len(chunk) / self.rate)
+
+    def send_paged(self, text):
+        """Send output, pausing at --More-- every pager_lines while the pager is on."""
+        lines = text.splitlines()
+        page = self.device.get("pager_lines", 24)
+        if not self.pager or len(lines) <= page:
+            self.send(text)
+            return
+
+        for start in range(0, len(lines), page):
+            self.send("\n".join(lines[start:start + page]) + "\n")
+            if start + page >= len(lines):
+                return
+            self.send("--More-- ")
+            char = self.read_char()
+            self.send("\r         \r")
+            # Space pages on; anything else (including typed-ahead commands) aborts
+            if char != " ":
+                return
+
+    def handle(self, command):
+        """Update CLI state for a command and return its output."""
+        words = command.split()
+        if not words:
+            return ""
+
+        if self.fortigate:
+            if words[0] == "config" and len(words) > 1:
+                if words[1:] == ["global"] or words[1:] == ["vdom"]:
+                    self.context.append(words[1])
+                else:
+                    self.context.append(words[-1])
+                return ""
+            if words[0] == "edit":
+                self.context.append(words[1].strip('"') if len(words) > 1 else "edit")
+                return ""
+            if words[0] in ("next", "end"):
+                if self.context:
+                    self.context.pop()
+                return ""
+            if words[0] == "set":
+                if self.context and self.context[-1] == "console" and words[1:2] == ["output"]:
+                    self.pager = words[2:3] != ["standard"]
+                return ""
+        else:
+            if words[:2] == ["terminal", "length"]:
+                self.pager = words[2:3] != ["0"]
+                return ""
+            if words[0] in ("terminal", "enable"):
+                return ""
+            if words[:2] == ["configure", "terminal"]:
+                self.context.append("config")
+                return ""
+            if words[0] == "end":
+                self.context = []
+                return ""
+
+        path = recording_file(self.recording, command)
+        if not path.exists():
+            return (FORTIGATE_INVALID if self.fortigate else INVALID_INPUT) + "\n"
+
+        return path.read_text()
+
+    def run(self):
+        self.send(self.prompt())
+        while True:
+            command = self.read_line()
+            if command is None:
+                return
+            self.send(command + "\n")
+            output = self.handle(command.strip())
+            if output:
+                time.sleep(self.latency)
+                self.send_paged(output)
+            self.send(self.prompt())
+
+
+def serve_client(client, recording, latency, rate, host_key):
+    transport = paramiko.Transport(client)
+    transport.add_server_key(host_key)
+    server = DeviceServer()
+    try:
+        transport.start_server(server=server)
+        channel = transport.accept(20)
+        if channel is None or not server.shell_requested.wait(10):
+            return
+        CliSession(channel, recording, latency, rate).run()
+    except (EOFError, OSError, paramiko.SSHException):
+        pass
+    finally:
+        transport.close()
+
+
+def start_device(recording, port=0, latency=0.05, rate=512 * 1024):
+    """Start a fake device in a background thread; returns the bound port."""
+    recording = Path(recording)
+    host_key = paramiko.RSAKey.generate(2048)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", port))
+    listener.listen(16)
+
+    def accept_loop():
+        while True:
+            client, _ = listener.accept()
+            threading.Thread(
+                target=serve_client,
+                args=(client, recording, latency, rate, host_key),
+                daemon=True,
+            ).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return listener.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake network device replaying recorded CLI output")
+    parser.add_argument("recording", help="Recording directory (e.g. scripts/recordings/ios)")
+    parser.add_argument("--port", type=int, default=2222, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Delay before each command's output")
+    parser.add_argument("--kbps", type=float, default=512, help="Output rate in KiB/s (0 for unlimited)")
+    args = parser.parse_args()
+
+    port = start_device(args.recording, args.port, args.latency_ms / 1000, args.kbps * 1024)
+    print(f"Replaying {args.recording} on 127.0.0.1:{port} (Ctrl-C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,120 @@
 #!/usr/bin/env python3
 """
 FortiGate SSH Configuration Retriever
-Retrieves full configuration from FortiGate firewalls via SSH.
+Retrieves configuration from FortiGate firewalls via SSH.
 Outputs JSON with hostname and configuration lines.
+
+Uses `show` (non-default settings only) rather than `show full-configuration`
+and reads each reply up to the CLI prompt instead of waiting for the session
+to go quiet. The console pager is left as configured (changing it would be a
+config revision on every collection); --More-- pages are answered as they
+arrive. Set FORTIGATE_VDOM to fetch a single VDOM's configuration.
 """
 
 import os
+import re
 import json
 import paramiko
 
 # Get credentials from environment variables
 host = os.environ.get("FORTIGATE_HOST", "192.168.1.99")
+port = int(os.environ.get("FORTIGATE_PORT", "22"))
 username = os.environ.get("FORTIGATE_USER", "admin")
 password = os.environ.get("FORTIGATE_PASSWORD", "")
+vdom = os.environ.get("FORTIGATE_VDOM", "")
+
+# CLI prompt, e.g. "FGT60F # " or "FGT60F (global) # "
+PROMPT = re.compile(r"^[\w.-]+ (?:\([\w.-]+\) )?[#$] ", re.MULTILINE)
 
-if not password:
-    print(json.dumps({"error": "FORTIGATE_PASSWORD environment variable not set"}))
-    exit(1)
+# Pager prompt, e.g. "--More-- " followed by "\r         \r" once answered
+MORE = re.compile(r" ?--More-- ?(?:\r *\r)?")
 
 
-def recv_until_timeout(shell, timeout=5):
-    """Receive data from shell until timeout."""
+def read_until_prompts(shell, count, timeout=30):
+    """Receive data from shell until `count` CLI prompts have been seen."""
     shell.settimeout(timeout)
     output = ""
-    while True:
-        try:
-            data = shell.recv(1024).decode("utf-8")
-            if not data:
-                break
-            output += data
-            if "--More--" in data:
-                shell.send(" ")
-        except Exception:
+    seen = 0
+    scan = 0
+    while seen < count:
+        data = shell.recv(65536).decode("utf-8", errors="replace")
+        if not data:
             break
-    return output
+        output += data
+        if output.rstrip(" ").endswith("--More--"):
+            shell.send(" ")
+        for match in PROMPT.finditer(output, scan):
+            seen += 1
+            scan = match.end()
+        # Prompts start a line, so only the last (partial) line can still match
+        scan = max(scan, output.rfind("\n") + 1)
+    # Drop the pager prompt and the carriage-return erase that follows it
+    return MORE.sub("", output)
+
 
+def run_commands(shell, commands, timeout=30):
+    """Send commands in one write and return each command's output.
 
-try:
-    # Connect to FortiGate via SSH
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect(hostname=host, username=username, password=password)
+    Only the last command may produce paged output: the pager would swallow
+    anything typed ahead of its --More-- prompt.
+    """
+    shell.send("".join(f"{command}\n" for command in commands))
+    output = read_until_prompts(shell, len(commands), timeout)
 
-    shell = ssh.invoke_shell()
+    replies = []
+    for command, part in zip(commands, PROMPT.split(output)):
+        lines = part.splitlines()
+        if lines and lines[0].strip() == command:
+            lines = lines[1:]
+        replies.append("\n".join(lines))
+    return replies
 
-    # Get hostname from system status
-    shell.send("get system status\n")
-    status_output = recv_until_timeout(shell)
 
+def fetch_configuration(shell, vdom=""):
+    """Return (hostname, configuration text) from an open CLI shell."""
+    read_until_prompts(shell, 1)
+
+    status_output = run_commands(shell, ["get system status"])[0]
     hostname = "unknown"
     for line in status_output.splitlines():
         if "Hostname:" in line:
             hostname = line.split(":")[1].strip()
             break
 
-    # Get full configuration
-    shell.send("show full-configuration\n")
-    config_output = recv_until_timeout(shell, timeout=30)
+    if vdom:
+        config_output = run_commands(shell, ["config vdom", f"edit {vdom}", "show"], timeout=60)[-1]
+        run_commands(shell, ["end"])
+    else:
+        config_output = run_commands(shell, ["show"], timeout=60)[0]
+
+    return hostname, config_output
+
+
+if __name__ == "__main__":
+    if not password:
+        print(json.dumps({"error": "FORTIGATE_PASSWORD environment variable not set"}))
+        exit(1)
+
+    try:
+        # Connect to FortiGate via SSH
+        ssh = paramiko.SSHClient()
+        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        ssh.connect(hostname=host, port=port, username=username, password=password)
+
+        shell = ssh.invoke_shell()
+        hostname, config_output = fetch_configuration(shell, vdom)
 
-    ssh.close()
+        ssh.close()
 
-    # Clean up output
-    config_output = config_output.replace("--More--", "").strip()
-    config_lines = config_output.splitlines()
+        # Clean up output
+        config_lines = [line.rstrip("\r") for line in config_output.strip().splitlines()]
 
-    result = {
-        "hostname": hostname,
-        "configuration": config_lines
-    }
-    print(json.dumps(result, indent=4))
+        result = {
+            "hostname": hostname,
+            "configuration": config_lines
+        }
+        print(json.dumps(result, indent=4))
 
-except Exception as e:
-    print(json.dumps({"error": str(e)}))
-    exit(1)
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        exit(1)
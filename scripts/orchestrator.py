@@ -11,18 +11,30 @@ Single Python script that orchestrates the entire config backup workflow:
 
 Usage:
     python orchestrator.py [--git] [--vault-password-file FILE]
+
+Also importable as a library: run_collection(hosts, ...) has the same
+semantics as the CLI. When Ansible's Python API is available, inventory
+and playbook execution run in-process and are initialized once per
+process (see init_worker()), so repeated jobs skip interpreter and
+Ansible start-up.
 """
 
+import io
 import os
 import re
 import sys
 import json
+import contextlib
 import shutil
+import bisect
+import hashlib
+import fcntl
 import argparse
 import subprocess
+from array import array
 from pathlib import Path
 from datetime import datetime
-from difflib import unified_diff
+from difflib import SequenceMatcher
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
@@ -31,6 +43,54 @@ INVENTORY = PROJECT_ROOT / "playbooks" / "inventory.yml"
 CONFIG_DIR = PROJECT_ROOT / "output" / "configs"
 CHANGES_DIR = PROJECT_ROOT / "output" / "changes"
 LOG_DIR = PROJECT_ROOT / "output" / "logs"
+SUMMARY_FILE = PROJECT_ROOT / "output" / "summary.json"
+HISTORY_DIR = PROJECT_ROOT / "output" / "history"
+
+# Store a full snapshot every N versions; others are forward deltas
+KEYFRAME_INTERVAL = 20
+
+CHANGESETS_FILE = PROJECT_ROOT / "output" / "changesets.json"
+INDEX_DIR = PROJECT_ROOT / "output" / "index"
+
+# Line offset indexes record the byte offset of every Nth line
+LINE_INDEX_STEP = 256
+
+EVENTS_DIR = PROJECT_ROOT / "output" / "events"
+
+# Per-host retrieval state kept by the playbook (e.g. IOS change markers)
+CACHE_DIR = PROJECT_ROOT / "output" / "cache"
+
+# Event log segments roll over at this size
+EVENT_SEGMENT_BYTES = 1024 * 1024
+
+# Newest segments kept verbatim; older ones are compacted to the latest
+# event per (type, host), and segments beyond EVENT_SEGMENTS_MAX are dropped
+EVENT_SEGMENTS_HOT = 4
+EVENT_SEGMENTS_MAX = 50
+
+# Identical hunks seen within this many hours are grouped into one change-set
+CORRELATION_WINDOW_HOURS = 6
+
+# Number of change-sets kept in CHANGESETS_FILE
+CHANGESETS_LIMIT = 500
+
+# Host-specific tokens masked before hunks are compared across hosts:
+# addresses and interface names only (VLAN IDs, ports etc. carry meaning)
+IPV6_GROUP = r'[0-9a-fA-F]{1,4}'
+HUNK_MASKS = [
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?:/\d{1,2})?\b'), '<IP>'),
+    # IPv6: full eight-group form, or compressed (must contain "::")
+    (re.compile(
+        rf'(?<![\w:])(?:(?:{IPV6_GROUP}:){{7}}{IPV6_GROUP}|(?:{IPV6_GROUP}:){{0,6}}(?:{IPV6_GROUP})?::(?:{IPV6_GROUP}:){{0,6}}(?:{IPV6_GROUP})?)'
+        r'(?:/\d{1,3})?(?![\w:])'), '<IP>'),
+    (re.compile(
+        r'\b(Ethernet|Eth|GigabitEthernet|Gi|TenGigabitEthernet|Te|FastEthernet|Fa|'
+        r'port-channel|Port-channel|Po|loopback|Loopback|mgmt|swp|bond)'
+        r'\d+(?:/\d+)*(?:\.\d+)?\b'), r'\1<N>'),
+]
+
+# Number of entries kept in the fleet summary's recent changes ring buffer
+RECENT_CHANGES_LIMIT = 10
 
 # Patterns to ignore in diff (timestamps, etc.)
 IGNORE_PATTERNS = [
@@ -39,6 +99,31 @@ IGNORE_PATTERNS = [
     r'^ntp clock-period',
     r'^! Last configuration change at',
 ]
+IGNORE_LINES = re.compile("|".join(IGNORE_PATTERNS).encode())
+
+# Number of unchanged lines shown around each diff hunk
+DIFF_CONTEXT = 3
+
+# Block size used to skip runs of identical lines
+DIFF_SKIP_BLOCK = 4096
+
+# Lines per side handed to SequenceMatcher to resynchronize after a change
+DIFF_MATCH_WINDOW = 2000
+
+# Log lines worth surfacing as errors (single alternation, one pass per log)
+ERROR_PATTERN = re.compile(r'\[ERROR\]|error:|FAILED|fatal:|unreachable', re.IGNORECASE)
+
+# Ansible task failure lines, e.g. "fatal: [host]: UNREACHABLE! => {...}"
+FAILURE_LINE = re.compile(r'^(?:fatal|failed): \[([^\]]+)\]')
+
+# Failure classification, checked in order (first match wins)
+FAILURE_REASONS = [
+    ("auth_failure", re.compile(
+        r'authentication fail|auth fail|permission denied|login incorrect|'
+        r'invalid (?:username|password|credentials)', re.IGNORECASE)),
+    ("command_timeout", re.compile(r'command timeout|command_timeout', re.IGNORECASE)),
+    ("unreachable", re.compile(r'UNREACHABLE!|"unreachable": true', re.IGNORECASE)),
+]
 
 
 def setup_directories():
@@ -46,10 +131,128 @@ def setup_directories():
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     CHANGES_DIR.mkdir(parents=True, exist_ok=True)
     LOG_DIR.mkdir(parents=True, exist_ok=True)
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def inventory_mtime():
+    """Latest modification time of the inventory and host/group vars."""
+    files = [INVENTORY]
+    files.extend((INVENTORY.parent / "host_vars").glob("*.yml"))
+    files.extend((INVENTORY.parent / "group_vars").glob("*.yml"))
+    return max(f.stat().st_mtime_ns for f in files)
+
+
+class PlaybookRunner:
+    """In-process ansible-playbook with inventory loaded once per process."""
+
+    def __init__(self, vault_password_file=None):
+        # ansible.cfg is located when ansible.constants is first imported
+        os.environ.setdefault("ANSIBLE_CONFIG", str(PROJECT_ROOT / "ansible.cfg"))
+
+        from ansible import context
+        from ansible.module_utils.common.collections import ImmutableDict
+        from ansible.parsing.dataloader import DataLoader
+        from ansible.parsing.vault import VaultSecret
+        from ansible.inventory.manager import InventoryManager
+        from ansible.vars.manager import VariableManager
+        from ansible.executor.playbook_executor import PlaybookExecutor
+        from ansible.plugins.loader import init_plugin_loader
+
+        # The CLI does this on start-up; without it no module (not even
+        # ansible.builtin ones) can be resolved
+        init_plugin_loader()
+
+        context.CLIARGS = ImmutableDict(
+            inventory=[str(INVENTORY)], subset=None, forks=10, verbosity=0,
+            connection="smart", timeout=None, remote_user=None, private_key_file=None,
+            become=False, become_method="sudo", become_user=None, become_ask_pass=False,
+            ask_pass=False, check=False, diff=False, syntax=False, start_at_task=None,
+            listhosts=False, listtasks=False, listtags=False, step=False,
+            tags=("all",), skip_tags=(), extra_vars=(), flush_cache=False,
+            module_path=None, ssh_common_args="", ssh_extra_args="",
+            sftp_extra_args="", scp_extra_args="",
+        )
+
+        self.classes = (DataLoader, InventoryManager, VariableManager, PlaybookExecutor)
+        self.vault_secrets = []
+        vault_password_file = vault_password_file or os.environ.get("ANSIBLE_VAULT_PASSWORD_FILE")
+        if vault_password_file:
+            password = Path(vault_password_file).read_bytes().strip()
+            self.vault_secrets = [("default", VaultSecret(password))]
+
+        self.load_inventory()
+
+    def load_inventory(self):
+        """(Re)load inventory and variables with a fresh file cache."""
+        loader_class, inventory_class, variable_manager_class, _ = self.classes
+        self.loader = loader_class()
+        if self.vault_secrets:
+            self.loader.set_vault_secrets(self.vault_secrets)
+        self.inventory = inventory_class(loader=self.loader, sources=[str(INVENTORY)])
+        self.variable_manager = variable_manager_class(loader=self.loader, inventory=self.inventory)
+        self.loaded_mtime = inventory_mtime()
+
+    def refresh(self):
+        """Reload the inventory if it changed since it was loaded."""
+        if inventory_mtime() != self.loaded_mtime:
+            self.load_inventory()
+
+    def hosts(self):
+        """Inventory hostnames."""
+        self.refresh()
+        return sorted(host.name for host in self.inventory.get_hosts())
+
+    def run(self, host):
+        """Run the gather playbook limited to one host; returns the exit code."""
+        self.refresh()
+        self.inventory.subset(host)
+        try:
+            executor = self.classes[3](
+                playbooks=[str(PLAYBOOK)],
+                inventory=self.inventory,
+                variable_manager=self.variable_manager,
+                loader=self.loader,
+                passwords={},
+            )
+            return executor.run()
+        finally:
+            self.inventory.subset(None)
+
+
+# Per-process state reused across collections
+worker_state = {
+    "runner": None,
+    "in_process": None,
+}
+
+
+def get_runner(vault_password_file=None):
+    """Get this process's PlaybookRunner, or None if Ansible isn't importable."""
+    if worker_state["in_process"] is None:
+        try:
+            worker_state["runner"] = PlaybookRunner(vault_password_file)
+            worker_state["in_process"] = True
+        except ImportError as e:
+            worker_state["in_process"] = False
+            print(f"  [WARN] Ansible's Python API unavailable ({e}); running ansible-playbook per job")
+    return worker_state["runner"]
+
+
+def init_worker(vault_password_file=None):
+    """Process pool initializer: load Ansible and the inventory once."""
+    setup_directories()
+    get_runner(vault_password_file)
 
 
 def get_hosts():
     """Extract hosts from Ansible inventory."""
+    runner = get_runner()
+    if runner:
+        return runner.hosts()
+
     try:
         result = subprocess.run(
             ["ansible-inventory", "-i", str(INVENTORY), "--list"],
@@ -66,11 +269,28 @@ def get_hosts():
 
         return sorted(hosts)
     except subprocess.CalledProcessError as e:
-        print(f"Error reading inventory: {e.stderr}", file=sys.stderr)
-        sys.exit(1)
+        raise RuntimeError(f"Error reading inventory: {e.stderr}")
     except json.JSONDecodeError as e:
-        print(f"Error parsing inventory JSON: {e}", file=sys.stderr)
-        sys.exit(1)
+        raise RuntimeError(f"Error parsing inventory JSON: {e}")
+
+
+@contextlib.contextmanager
+def redirect_output(log):
+    """Send this process's stdout/stderr (including child processes) to a file."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            yield
+    finally:
+        log.flush()
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        os.close(saved[0])
+        os.close(saved[1])
 
 
 def run_playbook(host, vault_password_file=None):
@@ -78,24 +298,36 @@ def run_playbook(host, vault_password_file=None):
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     log_file = LOG_DIR / f"{host}_{timestamp}.log"
 
-    cmd = [
-        "ansible-playbook",
-        str(PLAYBOOK),
-        "-i", str(INVENTORY),
-        "--limit", host,
-    ]
-
-    if vault_password_file:
-        cmd.extend(["--vault-password-file", vault_password_file])
-
     print(f"\n{'='*60}")
     print(f"Running playbook for: {host}")
     print(f"{'='*60}")
 
+    runner = get_runner(vault_password_file)
     with open(log_file, "w") as log:
-        result = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+        if runner:
+            with redirect_output(log):
+                try:
+                    returncode = runner.run(host)
+                except Exception as e:
+                    print(f"[ERROR] Playbook execution failed: {e}")
+                    returncode = 1
+        else:
+            cmd = [
+                "ansible-playbook",
+                str(PLAYBOOK),
+                "-i", str(INVENTORY),
+                "--limit", host,
+            ]
+
+            if vault_password_file:
+                cmd.extend(["--vault-password-file", vault_password_file])
+
+            returncode = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT).returncode
+
+    log_summary = write_log_summary(log_file)
+    record_collection_result(host, returncode == 0, log_summary["failure_counts"])
 
-    if result.returncode != 0:
+    if returncode != 0:
         print(f"  [ERROR] Playbook failed for {host}")
         print(f"  Log file: {log_file}")
         return False
@@ -105,6 +337,811 @@ def run_playbook(host, vault_password_file=None):
     return True
 
 
+def iter_error_lines(content):
+    """Yield (offset, line) for each error line, in a single regex pass."""
+    pos = 0
+    while True:
+        match = ERROR_PATTERN.search(content, pos)
+        if not match:
+            break
+        start = content.rfind("\n", 0, match.start()) + 1
+        end = content.find("\n", match.end())
+        if end == -1:
+            end = len(content)
+        yield start, content[start:end].strip()
+        # Resume after this line so each line is reported once
+        pos = end + 1
+
+
+def classify_failure(line):
+    """Classify an Ansible failure line into a failure reason."""
+    for reason, pattern in FAILURE_REASONS:
+        if pattern.search(line):
+            return reason
+    return "other"
+
+
+def summarize_log(content):
+    """Build the error summary for a playbook/job log."""
+    errors = []
+    failures = []
+    failure_counts = {}
+    for line_pos, line in iter_error_lines(content):
+        errors.append(line)
+        match = FAILURE_LINE.match(line)
+        if not match:
+            continue
+        # Attribute the failure to the most recent TASK header
+        task_pos = content.rfind("TASK [", 0, line_pos)
+        task = None
+        if task_pos != -1:
+            task = content[task_pos + 6:content.find("]", task_pos)]
+
+        reason = classify_failure(line)
+        failure_counts[reason] = failure_counts.get(reason, 0) + 1
+        failures.append({
+            "host": match.group(1),
+            "task": task,
+            "reason": reason,
+            "line": line
+        })
+
+    return {
+        "errors": errors,
+        "has_errors": len(errors) > 0,
+        "failures": failures,
+        "failure_counts": failure_counts
+    }
+
+
+def log_summary_file(log_file):
+    """Sidecar summary path for a log file."""
+    return Path(log_file).with_suffix(".summary.json")
+
+
+def write_log_summary(log_file, content=None):
+    """Write the error summary sidecar next to a log file."""
+    if content is None:
+        content = Path(log_file).read_text(errors="replace")
+
+    summary = summarize_log(content)
+    summary["log_file"] = Path(log_file).name
+    summary["generated_at"] = datetime.now().isoformat()
+
+    with open(log_summary_file(log_file), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
+
+def empty_fleet_summary():
+    """Fleet summary skeleton."""
+    return {
+        "total_configs": 0,
+        "total_changes": 0,
+        "recent_changes": [],
+        "failure_reasons": {},
+        "hosts": {},
+        "updated_at": None
+    }
+
+
+def host_summary_entry(summary, host):
+    """Get (or create) the per-host record in the fleet summary."""
+    return summary["hosts"].setdefault(host, {
+        "configs": 0,
+        "change_count": 0,
+        "last_change": None,
+        "last_success": None,
+        "last_failure": None,
+        "failure_counts": {}
+    })
+
+
+def rebuild_fleet_summary():
+    """Build the fleet summary from files on disk (first run only)."""
+    summary = empty_fleet_summary()
+
+    for f in CONFIG_DIR.glob("*.json"):
+        match = re.match(r'(.+)_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.json$', f.name)
+        if match:
+            host_summary_entry(summary, match.group(1))["configs"] += 1
+            summary["total_configs"] += 1
+
+    for f in sorted(CHANGES_DIR.glob("*.diff"), key=lambda x: x.stat().st_mtime):
+        match = re.match(r'(.+)_change_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.diff$', f.name)
+        if match:
+            add_change_to_summary(summary, match.group(1), match.group(2), f.name)
+
+    return summary
+
+
+def add_change_to_summary(summary, host, timestamp, filename):
+    """Record a new diff in the fleet summary."""
+    entry = host_summary_entry(summary, host)
+    entry["change_count"] += 1
+    entry["last_change"] = timestamp
+    summary["total_changes"] += 1
+    summary["recent_changes"].insert(0, {
+        "hostname": host,
+        "timestamp": timestamp,
+        "filename": filename
+    })
+    del summary["recent_changes"][RECENT_CHANGES_LIMIT:]
+
+
+def update_json_file(path, initial, update):
+    """Apply an update to a shared JSON state file under an exclusive lock.
+
+    initial() builds the state when the file is missing or unreadable.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = path.with_suffix(".lock")
+
+    # Jobs for different hosts may finish concurrently
+    with open(lock_file, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        data = None
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+            except json.JSONDecodeError:
+                data = None
+        if data is None:
+            data = initial()
+
+        update(data)
+
+        tmp_file = path.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_file, path)
+
+    return data
+
+
+def update_fleet_summary(update):
+    """Apply an incremental update to the persisted fleet summary."""
+    def apply(summary):
+        update(summary)
+        summary["updated_at"] = datetime.now().isoformat()
+
+    return update_json_file(SUMMARY_FILE, rebuild_fleet_summary, apply)
+
+
+def record_collection_result(host, success, failure_counts=None):
+    """Record a collection success/failure for a host in the fleet summary."""
+    def update(summary):
+        entry = host_summary_entry(summary, host)
+        entry[("last_success" if success else "last_failure")] = datetime.now().isoformat()
+
+        if failure_counts is None:
+            return
+        # Replace this host's previous failure reasons in the fleet totals
+        reasons = summary["failure_reasons"]
+        for reason, count in entry["failure_counts"].items():
+            reasons[reason] = reasons.get(reason, 0) - count
+            if reasons[reason] <= 0:
+                del reasons[reason]
+        for reason, count in failure_counts.items():
+            reasons[reason] = reasons.get(reason, 0) + count
+        entry["failure_counts"] = dict(failure_counts)
+
+    return update_fleet_summary(update)
+
+
+def record_config_state(host, config_count, diff_file=None):
+    """Record a host's config file count and any new diff in the fleet summary."""
+    def update(summary):
+        entry = host_summary_entry(summary, host)
+        summary["total_configs"] += config_count - entry["configs"]
+        entry["configs"] = config_count
+
+        # A first-run rebuild may already have picked this diff up
+        recorded = {change["filename"] for change in summary["recent_changes"]}
+        if diff_file and diff_file.name not in recorded:
+            match = re.search(r'_change_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.diff$', diff_file.name)
+            add_change_to_summary(summary, host, match.group(1), diff_file.name)
+
+    return update_fleet_summary(update)
+
+
+def config_timestamp(config_file):
+    """Extract the timestamp from a config filename."""
+    match = re.search(r'_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.json$', config_file.name)
+    return match.group(1) if match else datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+
+
+def load_history_index(host):
+    """Load the version index for a host's config history."""
+    index_file = HISTORY_DIR / host / "index.json"
+    if not index_file.exists():
+        return []
+    return json.loads(index_file.read_text())
+
+
+def make_delta(prev_lines, new_lines):
+    """Encode new_lines as copy/insert operations against prev_lines."""
+    ops = []
+    matcher = SequenceMatcher(None, prev_lines, new_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append(["+", new_lines[j1:j2]])
+    return ops
+
+
+def apply_delta(prev_lines, ops):
+    """Rebuild lines from a base and a delta made by make_delta()."""
+    lines = []
+    for op in ops:
+        if op[0] == "=":
+            lines.extend(prev_lines[op[1]:op[2]])
+        else:
+            lines.extend(op[1])
+    return lines
+
+
+def reconstruct_version(host, version, index=None):
+    """Rebuild a stored config version from its nearest keyframe."""
+    if index is None:
+        index = load_history_index(host)
+    if not 1 <= version <= len(index):
+        raise KeyError(f"{host} has no version {version}")
+
+    host_dir = HISTORY_DIR / host
+    base = version
+    while index[base - 1]["kind"] != "keyframe":
+        base -= 1
+
+    lines = (host_dir / index[base - 1]["file"]).read_text().splitlines(keepends=True)
+    for entry in index[base:version]:
+        ops = json.loads((host_dir / entry["file"]).read_text())
+        lines = apply_delta(lines, ops)
+
+    return "".join(lines)
+
+
+def append_history(host, config_file):
+    """Store a config as the next version in the host's delta chain."""
+    host_dir = HISTORY_DIR / host
+    host_dir.mkdir(parents=True, exist_ok=True)
+
+    index = load_history_index(host)
+    version = len(index) + 1
+    content = config_file.read_text()
+
+    if (version - 1) % KEYFRAME_INTERVAL == 0:
+        kind = "keyframe"
+        filename = f"{version:06d}.snap"
+        (host_dir / filename).write_text(content)
+    else:
+        kind = "delta"
+        filename = f"{version:06d}.delta"
+        prev_lines = reconstruct_version(host, version - 1, index).splitlines(keepends=True)
+        ops = make_delta(prev_lines, content.splitlines(keepends=True))
+        (host_dir / filename).write_text(json.dumps(ops))
+
+    index.append({
+        "version": version,
+        "timestamp": config_timestamp(config_file),
+        "kind": kind,
+        "file": filename,
+        "source": config_file.name
+    })
+    tmp_file = host_dir / "index.json.tmp"
+    tmp_file.write_text(json.dumps(index, indent=2))
+    os.replace(tmp_file, host_dir / "index.json")
+
+    return version
+
+
+def line_stream_matches(stream, line):
+    """Check whether a line belongs to an indexed line stream."""
+    if stream == "additions":
+        return line.startswith(b"+") and not line.startswith(b"+++")
+    if stream == "removals":
+        return line.startswith(b"-") and not line.startswith(b"---")
+    return True
+
+
+def line_index_file(path):
+    """Where the line offset index of a config or diff file is stored."""
+    return INDEX_DIR / f"{Path(path).name}.lines.json"
+
+
+def remove_with_line_index(path):
+    """Delete a config or diff file together with its line offset index."""
+    path.unlink()
+    line_index_file(path).unlink(missing_ok=True)
+
+
+def build_line_index(path):
+    """Build and store the line offset index for a config or diff file.
+
+    Streams are "all" lines plus diff "additions"/"removals"; sections are
+    the === headed blocks of a config, trimmed of surrounding blank lines.
+    """
+    path = Path(path)
+    stat = path.stat()
+    streams = {name: {"count": 0, "offsets": []} for name in ("all", "additions", "removals")}
+    sections = []
+    current = None
+
+    with open(path, "rb") as f:
+        offset = 0
+        for line_no, line in enumerate(f):
+            for name, stream in streams.items():
+                if line_stream_matches(name, line):
+                    if stream["count"] % LINE_INDEX_STEP == 0:
+                        stream["offsets"].append(offset)
+                    stream["count"] += 1
+            offset += len(line)
+
+            if line.startswith(b"===") and b"===" in line[3:]:
+                current = {"title": line.decode(errors="replace").strip("= \r\n"), "start": None, "end": None}
+                sections.append(current)
+            elif current is not None and line.strip():
+                if current["start"] is None:
+                    current["start"] = line_no
+                current["end"] = line_no + 1
+
+    index = {
+        "file": path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "step": LINE_INDEX_STEP,
+        "streams": streams,
+        "sections": [
+            {
+                "title": section["title"],
+                "start": section["start"] or 0,
+                "count": (section["end"] - section["start"]) if section["start"] is not None else 0
+            }
+            for section in sections
+        ]
+    }
+
+    INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    line_index_file(path).write_text(json.dumps(index))
+    return index
+
+
+def load_line_index(path):
+    """Load a file's line offset index, rebuilding it if stale or missing."""
+    path = Path(path)
+    index_file = line_index_file(path)
+    if index_file.exists():
+        try:
+            index = json.loads(index_file.read_text())
+            stat = path.stat()
+            if index["size"] == stat.st_size and index["mtime_ns"] == stat.st_mtime_ns:
+                return index
+        except (json.JSONDecodeError, KeyError):
+            pass
+    return build_line_index(path)
+
+
+def read_line_window(path, index, stream="all", start=0, limit=200):
+    """Read up to `limit` lines of a stream starting at line `start`.
+
+    Seeks to the nearest indexed offset, so cost depends on the window
+    size rather than the file size. Diff markers are stripped from
+    additions/removals.
+    """
+    info = index["streams"][stream]
+    if start >= info["count"] or limit <= 0:
+        return []
+
+    block = start // index["step"]
+    skip = start - block * index["step"]
+    lines = []
+
+    with open(path, "rb") as f:
+        f.seek(info["offsets"][block])
+        for line in f:
+            if not line_stream_matches(stream, line):
+                continue
+            if skip:
+                skip -= 1
+                continue
+            text = line.decode(errors="replace").rstrip("\r\n")
+            lines.append(text[1:] if stream != "all" else text)
+            if len(lines) >= limit:
+                break
+
+    return lines
+
+
+def event_segments():
+    """Event log segment files, oldest first."""
+    return sorted(EVENTS_DIR.glob("*.log"))
+
+
+def append_event(event_type, host=None, **data):
+    """Append an event to the change event log; returns its offset."""
+    EVENTS_DIR.mkdir(parents=True, exist_ok=True)
+    head_file = EVENTS_DIR / "head.json"
+
+    with open(EVENTS_DIR / "events.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        head = {"next_offset": 0, "segment": None}
+        if head_file.exists():
+            head = json.loads(head_file.read_text())
+
+        offset = head["next_offset"]
+        segment = EVENTS_DIR / head["segment"] if head["segment"] else None
+        if segment is None or not segment.exists() or segment.stat().st_size >= EVENT_SEGMENT_BYTES:
+            segment = EVENTS_DIR / f"{offset:012d}.log"
+            head["segment"] = segment.name
+            rotate_event_segments(segment)
+
+        event = {
+            "offset": offset,
+            "time": datetime.now().isoformat(),
+            "type": event_type,
+            "host": host,
+            "data": data
+        }
+        with open(segment, "a") as f:
+            f.write(json.dumps(event) + "\n")
+
+        head["next_offset"] = offset + 1
+        tmp_file = head_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(head))
+        os.replace(tmp_file, head_file)
+
+    return offset
+
+
+def rotate_event_segments(new_segment):
+    """Compact the segment leaving the hot set and drop expired segments."""
+    segments = [f for f in event_segments() if f != new_segment]
+
+    # The segment that just became the (EVENT_SEGMENTS_HOT + 1)th newest
+    if len(segments) >= EVENT_SEGMENTS_HOT:
+        compact_event_segment(segments[-EVENT_SEGMENTS_HOT])
+
+    for segment in segments[:max(0, len(segments) + 1 - EVENT_SEGMENTS_MAX)]:
+        segment.unlink()
+
+
+def compact_event_segment(segment):
+    """Keep only the latest event per (type, host) in a segment, offsets intact."""
+    latest = {}
+    with open(segment) as f:
+        for line in f:
+            event = json.loads(line)
+            latest[(event["type"], event["host"])] = event
+
+    events = sorted(latest.values(), key=lambda event: event["offset"])
+    tmp_file = segment.with_suffix(".tmp")
+    tmp_file.write_text("".join(json.dumps(event) + "\n" for event in events))
+    os.replace(tmp_file, segment)
+
+
+def event_log_head():
+    """Offset the next appended event will get."""
+    head_file = EVENTS_DIR / "head.json"
+    if not head_file.exists():
+        return 0
+    return json.loads(head_file.read_text())["next_offset"]
+
+
+def read_events(since=0, limit=1000):
+    """Read events with offset >= since, oldest first.
+
+    Reads take no lock: segments removed by rotation after the glob are
+    skipped, and reading stops at a last line that is still being written.
+    """
+    segments = event_segments()
+    bases = [int(f.stem) for f in segments]
+
+    # Start from the segment that holds `since`
+    first = max(0, bisect.bisect_right(bases, since) - 1)
+    events = []
+    for segment in segments[first:]:
+        try:
+            f = open(segment)
+        except FileNotFoundError:
+            continue
+        with f:
+            for line in f:
+                if not line.endswith("\n"):
+                    return events
+                event = json.loads(line)
+                if event["offset"] < since:
+                    continue
+                events.append(event)
+                if len(events) >= limit:
+                    return events
+    return events
+
+
+def section_at(section_starts, line_number):
+    """Title of the config section containing a (1-based) line number."""
+    pos = bisect.bisect_right(section_starts, (line_number, "\uffff")) - 1
+    return section_starts[pos][1] if pos >= 0 else "(preamble)"
+
+
+def hash_config_lines(path):
+    """Hash a config's lines (minus ignored ones) without keeping their text.
+
+    Returns a dict with 64-bit line hashes, byte offsets of the kept lines
+    (to re-read changed lines later) and (line number, title) of === headers.
+    """
+    hashes = array("q")
+    offsets = array("q")
+    sections = []
+
+    with open(path, "rb") as f:
+        offset = 0
+        for raw in f:
+            line = raw.rstrip(b"\r\n")
+            if not IGNORE_LINES.match(line):
+                hashes.append(hash(line))
+                offsets.append(offset)
+                if line.startswith(b"===") and b"===" in line[3:]:
+                    sections.append((len(hashes), line.decode(errors="replace").strip("= ")))
+            offset += len(raw)
+
+    return {"hashes": hashes, "offsets": offsets, "sections": sections}
+
+
+def common_run_length(a, b, i, j, a_end, b_end):
+    """Length of the identical run of two hash arrays from a[i] / b[j], compared blockwise."""
+    limit = min(a_end - i, b_end - j)
+    length = 0
+    while length < limit:
+        size = min(DIFF_SKIP_BLOCK, limit - length)
+        if a[i + length:i + length + size] == b[j + length:j + length + size]:
+            length += size
+            continue
+        while a[i + length] == b[j + length]:
+            length += 1
+        return length
+    return limit
+
+
+def common_suffix_length(a, b, limit):
+    """Length of the identical run at the end of two hash arrays, at most limit."""
+    length = 0
+    while length < limit:
+        size = min(DIFF_SKIP_BLOCK, limit - length)
+        if a[len(a) - length - size:len(a) - length] == b[len(b) - length - size:len(b) - length]:
+            length += size
+            continue
+        while a[len(a) - 1 - length] == b[len(b) - 1 - length]:
+            length += 1
+        return length
+    return limit
+
+
+def unique_line_anchor(a, b):
+    """First pair of positions on the longest in-order run of lines unique to both a and b.
+
+    Patience diff's anchor choice: lines occurring exactly once on each side
+    are matched up, and the longest increasing subsequence of their
+    positions decides which matches to trust.
+    """
+    positions = {}
+    for pos, line in enumerate(a):
+        positions[line] = -1 if line in positions else pos
+    seen = {}
+    for pos, line in enumerate(b):
+        if positions.get(line, -1) >= 0:
+            seen[line] = -1 if line in seen else pos
+    pairs = sorted((pos, positions[line]) for line, pos in seen.items() if pos >= 0)
+    if not pairs:
+        return None
+
+    # Patience sorting over a positions (in b order), keeping back-links
+    tails = []
+    tail_index = []
+    previous = [None] * len(pairs)
+    for index, (_, a_pos) in enumerate(pairs):
+        pile = bisect.bisect_left(tails, a_pos)
+        if pile:
+            previous[index] = tail_index[pile - 1]
+        if pile == len(tails):
+            tails.append(a_pos)
+            tail_index.append(index)
+        else:
+            tails[pile] = a_pos
+            tail_index[pile] = index
+
+    index = tail_index[-1]
+    while previous[index] is not None:
+        index = previous[index]
+    b_pos, a_pos = pairs[index]
+    return a_pos, b_pos
+
+
+def find_diff_anchor(a, b, i, j, a_end, b_end):
+    """Next point after a mismatch at a[i] / b[j] where both sides line up again.
+
+    Looks DIFF_MATCH_WINDOW lines ahead on each side and doubles the
+    lookahead until an anchor is found or the whole rest is covered.
+    Returns None if the rest has no line unique to both sides.
+    """
+    size = DIFF_MATCH_WINDOW
+    while True:
+        a_stop = min(a_end, i + size)
+        b_stop = min(b_end, j + size)
+        anchor = unique_line_anchor(a[i:a_stop], b[j:b_stop])
+        if anchor:
+            return i + anchor[0], j + anchor[1]
+        if a_stop == a_end and b_stop == b_end:
+            return None
+        size *= 2
+
+
+def match_diff_range(a, b, i, a_end, j, b_end):
+    """Yield opcodes for a[i:a_end] against b[j:b_end] (SequenceMatcher over the range)."""
+    if i == a_end:
+        yield ("insert", i, i, j, b_end)
+    elif j == b_end:
+        yield ("delete", i, a_end, j, j)
+    else:
+        matcher = SequenceMatcher(None, a[i:a_end].tolist(), b[j:b_end].tolist())
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            yield (tag, i + i1, i + i2, j + j1, j + j2)
+
+
+def iter_changed_opcodes(a, b, start, a_end, b_end):
+    """Yield opcodes for the changed middle a[start:a_end] / b[start:b_end]."""
+    i = j = start
+    while i < a_end or j < b_end:
+        run = common_run_length(a, b, i, j, a_end, b_end)
+        if run:
+            yield ("equal", i, i + run, j, j + run)
+            i, j = i + run, j + run
+            continue
+
+        anchor = find_diff_anchor(a, b, i, j, a_end, b_end)
+        if anchor is None:
+            yield from match_diff_range(a, b, i, a_end, j, b_end)
+            return
+        yield from match_diff_range(a, b, i, anchor[0], j, anchor[1])
+        i, j = anchor
+
+
+def iter_diff_opcodes(a, b):
+    """Yield SequenceMatcher-style opcodes for two hash arrays in one forward pass.
+
+    The common prefix and suffix are skipped blockwise. In between, each
+    mismatch resynchronizes on the next line unique to both sides (see
+    find_diff_anchor()) and only the lines up to it are matched with
+    SequenceMatcher; without such a line the rest is matched in one go.
+    """
+    prefix = common_run_length(a, b, 0, 0, len(a), len(b))
+    suffix = common_suffix_length(a, b, min(len(a), len(b)) - prefix)
+    a_end, b_end = len(a) - suffix, len(b) - suffix
+
+    head = [("equal", 0, prefix, 0, prefix)]
+    tail = [("equal", a_end, len(a), b_end, len(b))]
+    pending = None
+    for part in (head, iter_changed_opcodes(a, b, prefix, a_end, b_end), tail):
+        for opcode in part:
+            tag, i1, i2, j1, j2 = opcode
+            if i1 == i2 and j1 == j2:
+                continue
+            # Merge adjacent equal runs so hunks get the usual context
+            if pending and tag == "equal" and pending[0] == "equal":
+                pending = ("equal", pending[1], i2, pending[3], j2)
+                continue
+            if pending:
+                yield pending
+            pending = opcode
+    if pending:
+        yield pending
+
+
+def group_diff_opcodes(opcodes, context):
+    """Group a stream of opcodes into hunks, like SequenceMatcher.get_grouped_opcodes()."""
+    group = []
+    leading = None
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag != "equal":
+            if not group and leading:
+                group.append(leading)
+            group.append((tag, i1, i2, j1, j2))
+            continue
+        if group and i2 - i1 <= 2 * context:
+            group.append((tag, i1, i2, j1, j2))
+            continue
+        if group:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+        leading = (tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+
+    if group:
+        tag, i1, i2, j1, j2 = group[-1]
+        if tag == "equal":
+            group[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+        yield group
+
+
+def format_unified_range(start, stop):
+    """Hunk range in unified diff notation (as difflib formats it)."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def iter_streaming_diff(prev_file, new_file, prev, new, stats=None):
+    """Yield unified diff lines between two hashed configs.
+
+    Opcodes come from iter_diff_opcodes() over the line hashes, and line
+    text is re-read from disk as hunks are emitted. If given, stats
+    collects added/removed line counts per section of the new config.
+    """
+    opcodes = iter_diff_opcodes(prev["hashes"], new["hashes"])
+
+    with open(prev_file, "rb") as fa, open(new_file, "rb") as fb:
+        def read(f, offsets, i):
+            f.seek(offsets[i])
+            return f.readline().decode(errors="replace").rstrip("\r\n") + "\n"
+
+        started = False
+        for group in group_diff_opcodes(opcodes, DIFF_CONTEXT):
+            if not started:
+                started = True
+                yield f"--- {prev_file.name}\n"
+                yield f"+++ {new_file.name}\n"
+
+            first, last = group[0], group[-1]
+            a_range = format_unified_range(first[1], last[2])
+            b_range = format_unified_range(first[3], last[4])
+            yield f"@@ -{a_range} +{b_range} @@\n"
+
+            for tag, i1, i2, j1, j2 in group:
+                if tag == "equal":
+                    for i in range(i1, i2):
+                        yield " " + read(fa, prev["offsets"], i)
+                    continue
+                if tag in ("replace", "delete"):
+                    if stats is not None:
+                        title = section_at(new["sections"], max(1, j1))
+                        entry = stats.setdefault(title, {"added": 0, "removed": 0})
+                        entry["removed"] += i2 - i1
+                    for i in range(i1, i2):
+                        yield "-" + read(fa, prev["offsets"], i)
+                if tag in ("replace", "insert"):
+                    for j in range(j1, j2):
+                        if stats is not None:
+                            entry = stats.setdefault(section_at(new["sections"], j + 1), {"added": 0, "removed": 0})
+                            entry["added"] += 1
+                        yield "+" + read(fb, new["offsets"], j)
+
+
+def write_streaming_diff(prev_file, new_file, diff_file, header):
+    """Diff two configs straight to a file without loading either into memory.
+
+    Returns None if they are identical (ignoring IGNORE_PATTERNS lines),
+    otherwise per-section change stats for the new config.
+    """
+    prev = hash_config_lines(prev_file)
+    new = hash_config_lines(new_file)
+
+    if prev["hashes"] == new["hashes"]:
+        return None
+
+    stats = {}
+    with open(diff_file, "w") as f:
+        f.write(header)
+        f.writelines(iter_streaming_diff(prev_file, new_file, prev, new, stats))
+
+    return stats
+
+
 def get_config_files(host):
     """Get all config files for a host, sorted by timestamp."""
     pattern = f"{host}_*.json"
@@ -114,16 +1151,10 @@ def get_config_files(host):
 
 def filter_ignore_lines(content):
     """Remove lines matching ignore patterns."""
-    filtered = []
-    for line in content.splitlines():
-        skip = False
-        for pattern in IGNORE_PATTERNS:
-            if re.match(pattern, line):
-                skip = True
-                break
-        if not skip:
-            filtered.append(line)
-    return "\n".join(filtered)
+    return "\n".join(
+        line for line in content.splitlines()
+        if not IGNORE_LINES.match(line.encode())
+    )
 
 
 def diff_and_cleanup(host):
@@ -134,6 +1165,8 @@ def diff_and_cleanup(host):
 
     if len(files) < 2:
         print(f"  Not enough config files to compare ({len(files)} found)")
+        if files and not load_history_index(host):
+            append_history(host, files[-1])
         return None
 
     prev_file = files[-2]
@@ -142,40 +1175,126 @@ def diff_and_cleanup(host):
     print(f"  Previous: {prev_file.name}")
     print(f"  New:      {new_file.name}")
 
-    # Read and filter content
-    prev_content = filter_ignore_lines(prev_file.read_text())
-    new_content = filter_ignore_lines(new_file.read_text())
-
-    if prev_content == new_content:
-        print(f"  [IDENTICAL] No changes detected - removing new file")
-        new_file.unlink()
-        return None
-
-    # Create diff file
+    # Stream the diff to disk (ignoring IGNORE_PATTERNS lines)
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     diff_file = CHANGES_DIR / f"{host}_change_{timestamp}.diff"
+    header = f"Diff for {host} at {timestamp}\n" + "=" * 60 + "\n\n"
 
-    diff_lines = list(unified_diff(
-        prev_content.splitlines(keepends=True),
-        new_content.splitlines(keepends=True),
-        fromfile=str(prev_file.name),
-        tofile=str(new_file.name),
-    ))
+    section_stats = write_streaming_diff(prev_file, new_file, diff_file, header)
 
-    with open(diff_file, "w") as f:
-        f.write(f"Diff for {host} at {timestamp}\n")
-        f.write("=" * 60 + "\n\n")
-        f.writelines(diff_lines)
+    if section_stats is None:
+        print(f"  [IDENTICAL] No changes detected - removing new file")
+        remove_with_line_index(new_file)
+        return None
 
     print(f"  [CHANGED] Diff written to: {diff_file.name}")
 
+    append_event(
+        "config_changed", host,
+        diff_file=diff_file.name,
+        previous=prev_file.name,
+        config=new_file.name,
+        sections=section_stats
+    )
+
+    # Seed history with the baseline if this host predates it
+    if not load_history_index(host):
+        append_history(host, prev_file)
+    version = append_history(host, new_file)
+    print(f"  Stored as history version {version}")
+
     # Remove old file, keep new as baseline
-    prev_file.unlink()
+    remove_with_line_index(prev_file)
     print(f"  Removed old baseline: {prev_file.name}")
 
     return diff_file
 
 
+def split_hunks(diff_content):
+    """Split unified diff content into hunks of changed (+/-) lines."""
+    hunks = []
+    current = None
+    for line in diff_content.splitlines():
+        if line.startswith("@@"):
+            current = []
+            hunks.append(current)
+        elif current is not None and line[:1] in ("+", "-") and not line.startswith(("+++", "---")):
+            current.append(line)
+    return [hunk for hunk in hunks if hunk]
+
+
+def normalize_hunk(host, lines):
+    """Mask hostnames, addresses and interface names in hunk lines."""
+    # Whole names only: host leaf1 must not match leaf10 or leaf1-b
+    host_pattern = re.compile(rf'(?<![\w-]){re.escape(host)}(?![\w-])', re.IGNORECASE)
+    normalized = []
+    for line in lines:
+        for pattern, replacement in HUNK_MASKS:
+            line = pattern.sub(replacement, line)
+        normalized.append(host_pattern.sub("<HOST>", line))
+    return normalized
+
+
+def correlate_diff(host, diff_file):
+    """Group a host's diff hunks with identical changes seen on other hosts."""
+    hunks = split_hunks(diff_file.read_text())
+    if not hunks:
+        return []
+
+    now = datetime.now()
+    window_start = now.timestamp() - CORRELATION_WINDOW_HOURS * 3600
+    touched = []
+
+    def update(changesets):
+        for position, lines in enumerate(hunks):
+            normalized = normalize_hunk(host, lines)
+            hunk_hash = hashlib.sha1("\n".join(normalized).encode()).hexdigest()
+
+            # Join the most recent open change-set with the same hunk
+            changeset = None
+            for candidate in reversed(changesets):
+                if candidate["hunk_hash"] == hunk_hash and candidate["last_seen_ts"] >= window_start:
+                    changeset = candidate
+                    break
+            if changeset is None:
+                changeset = {
+                    "id": f"{hunk_hash[:12]}_{now.strftime('%Y%m%d%H%M%S')}",
+                    "hunk_hash": hunk_hash,
+                    "first_seen": now.isoformat(),
+                    "normalized": normalized,
+                    "hosts": [],
+                    "variants": [],
+                    "diff_files": {}
+                }
+                changesets.append(changeset)
+
+            changeset["last_seen"] = now.isoformat()
+            changeset["last_seen_ts"] = now.timestamp()
+            if host not in changeset["hosts"]:
+                changeset["hosts"].append(host)
+            changeset["host_count"] = len(changeset["hosts"])
+
+            # Hosts with the same raw hunk share a variant. Its lines stay in
+            # the .diff files; the variant points at the first host's hunk.
+            raw_hash = hashlib.sha1("\n".join(lines).encode()).hexdigest()
+            for variant in changeset["variants"]:
+                if variant["hash"] == raw_hash:
+                    break
+            else:
+                variant = {"hash": raw_hash, "hosts": [], "diff_file": diff_file.name, "hunk": position}
+                changeset["variants"].append(variant)
+            if host not in variant["hosts"]:
+                variant["hosts"].append(host)
+            changeset["diff_files"][host] = diff_file.name
+
+            touched.append(changeset["id"])
+
+        del changesets[:-CHANGESETS_LIMIT]
+
+    update_json_file(CHANGESETS_FILE, list, update)
+    return touched
+
+
 def display_diff(diff_file):
     """Display diff file content."""
     if not diff_file:
@@ -185,8 +1304,10 @@ def display_diff(diff_file):
     print(f"  DIFF CONTENT:")
     print(f"  {'='*50}")
 
-    # Try batcat first, fall back to cat
-    if shutil.which("batcat"):
+    # Try batcat first (terminals only), fall back to cat
+    if not sys.stdout.isatty():
+        print(diff_file.read_text())
+    elif shutil.which("batcat"):
         subprocess.run(["batcat", "--style=plain", str(diff_file)])
     elif shutil.which("bat"):
         subprocess.run(["bat", "--style=plain", str(diff_file)])
@@ -247,27 +1368,12 @@ def git_commit_and_push(host, config_file):
         print(f"  [ERROR] Git operation failed: {e}")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Network Configuration Orchestrator"
-    )
-    parser.add_argument(
-        "--git",
-        action="store_true",
-        help="Commit and push changes to git"
-    )
-    parser.add_argument(
-        "--vault-password-file",
-        type=str,
-        help="Path to Ansible Vault password file"
-    )
-    parser.add_argument(
-        "--host",
-        type=str,
-        help="Run for specific host only"
-    )
-    args = parser.parse_args()
+def run_collection(hosts=None, vault_password_file=None, git=False):
+    """Collect, diff and record configs for hosts (all hosts if None).
 
+    Returns {host: {"success": bool, "diff_file": name or None}}. Raises
+    ValueError for hosts not in the inventory.
+    """
     setup_directories()
 
     print("=" * 60)
@@ -279,18 +1385,23 @@ def main():
     print(f"Log dir:      {LOG_DIR}")
 
     # Get hosts
-    hosts = get_hosts()
-    if args.host:
-        if args.host not in hosts:
-            print(f"Error: Host '{args.host}' not found in inventory")
-            sys.exit(1)
-        hosts = [args.host]
+    inventory_hosts = get_hosts()
+    if hosts:
+        missing = [host for host in hosts if host not in inventory_hosts]
+        if missing:
+            raise ValueError(f"Host '{missing[0]}' not found in inventory")
+    else:
+        hosts = inventory_hosts
 
     print(f"\nHosts to process: {', '.join(hosts)}")
 
     # Process each host
+    results = {}
     for host in hosts:
-        success = run_playbook(host, args.vault_password_file)
+        append_event("collection_started", host)
+        success = run_playbook(host, vault_password_file)
+        results[host] = {"success": success, "diff_file": None}
+        append_event("collection_succeeded" if success else "collection_failed", host)
 
         if success:
             # Find the new config file
@@ -299,19 +1410,79 @@ def main():
 
             # Compare and cleanup
             diff_file = diff_and_cleanup(host)
+            config_files = get_config_files(host)
+            record_config_state(host, len(config_files), diff_file)
+
+            # Prebuild line indexes used for windowed viewing
+            if config_files:
+                build_line_index(config_files[-1])
+            if diff_file:
+                build_line_index(diff_file)
 
             # Display diff if changes found
             if diff_file:
+                results[host]["diff_file"] = diff_file.name
                 display_diff(diff_file)
+                correlate_diff(host, diff_file)
 
                 # Git operations if enabled
-                if args.git and new_config:
+                if git and new_config:
                     git_commit_and_push(host, new_config)
 
     print("\n" + "=" * 60)
     print("Orchestration complete")
     print("=" * 60)
 
+    return results
+
+
+def run_collection_job(host, vault_password_file=None):
+    """Run a collection for one host, capturing its console output.
+
+    Entry point for backend worker processes. Returns (ok, output, error)
+    where ok matches the CLI exit status (False only if the run errored).
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            run_collection([host], vault_password_file)
+            return True, output.getvalue(), None
+        except Exception as e:
+            print(f"Error: {e}")
+            return False, output.getvalue(), str(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Network Configuration Orchestrator"
+    )
+    parser.add_argument(
+        "--git",
+        action="store_true",
+        help="Commit and push changes to git"
+    )
+    parser.add_argument(
+        "--vault-password-file",
+        type=str,
+        help="Path to Ansible Vault password file"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        help="Run for specific host only"
+    )
+    args = parser.parse_args()
+
+    try:
+        run_collection(
+            [args.host] if args.host else None,
+            vault_password_file=args.vault_password_file,
+            git=args.git
+        )
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()